@@ -12,8 +12,11 @@ key_keys = ('validity', 'key_length', 'key_algo', 'keyid',
 
 # tuples for "gpg --with-colons" output
 Key = collections.namedtuple('Key', key_keys)
+# overflow is the name of the KeyLimits limit that the key exceeded
+# (its remaining records were not processed), or None
 PublicKey = collections.namedtuple('PublicKey',
-    key_keys + ('subkeys', 'uids'))
+    key_keys + ('subkeys', 'uids', 'overflow', 'fingerprint'),
+    defaults=(None, None))
 UID = collections.namedtuple('UID',
     ('validity', 'creation_date', 'expiration_date', 'uid_hash',
      'user_id'))
@@ -48,6 +51,23 @@ class KeyAlgo(enum.IntEnum):
     EDDSA               = 22
 
 
+class Description(collections.namedtuple('Description',
+        ('template', 'args'))):
+    """
+    Long description of an issue.  It holds a template string shared
+    between all issues of the same kind, and is formatted using @args
+    only when converted to str.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, template, args=()):
+        return super(Description, cls).__new__(cls, template, args)
+
+    def __str__(self):
+        return self.template.format(*self.args)
+
+
 KeyIssue = collections.namedtuple('KeyIssue',
     ('key', 'machine_desc', 'long_desc'))
 KeyWarning = collections.namedtuple('KeyWarning',
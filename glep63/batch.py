@@ -0,0 +1,286 @@
+# glep63-check -- batch checking of whole keyrings
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+from glep63.base import (FAIL, WARN, KeyAlgo, Validity)
+from glep63.check import (ALGO_OK, ALGO_DSA, ALGO_DSA_TOOSHORT,
+        ALGO_DSA_DISCOURAGED, ALGO_RSA_TOOSHORT, ALGO_RSA_SHORT, ALGO_ECC,
+        ALGO_ECC_INVALID, ALGO_INVALID, EXPIRE_OK, EXPIRE_NONE,
+        EXPIRE_LONG_FAIL, EXPIRE_LONG_WARN, EXPIRE_SHORT_FAIL,
+        EXPIRE_SHORT_WARN, RSA_DEPRECATED_ALGOS, DSA_ALGOS, ECC_ALGOS,
+        ECC_CURVES, EvaluationContext, check_key, check_key_specs,
+        check_uids, verdict_key_issues)
+from glep63.optional import (load_numpy,)
+from glep63.serialize import (encode_date,)
+from glep63.specs import (compile_spec,)
+
+# number of keys checked at once when processing them in chunks
+CHUNK_SIZE = 256
+# smallest number of keys checked using NumPy, for fewer keys building
+# the arrays costs more than it saves
+NUMPY_MIN_KEYS = 64
+
+# subkey validity classes
+SUBKEY_VALID, SUBKEY_INVALID, SUBKEY_SKIPPED = range(3)
+SUBKEY_VALIDITY = {
+    Validity.INVALID: SUBKEY_INVALID,
+    Validity.REVOKED: SUBKEY_SKIPPED,
+    Validity.EXPIRED: SUBKEY_SKIPPED,
+}
+BAD_KEY_VALIDITY = (Validity.INVALID, Validity.REVOKED, Validity.EXPIRED)
+
+
+def check_keys(keys, spec, context=None):
+    """
+    Check all keys in @keys against @spec.  Returns a list of results,
+    matching check_key() for every key.  @context is the
+    EvaluationContext to use; if None, a new one is created for
+    the current time.
+
+    If NumPy is available and there are at least NUMPY_MIN_KEYS keys,
+    the algorithm and expiration rules are evaluated as array operations
+    over all keys and subkeys, and only the keys that have any issues
+    are processed further in Python.  Otherwise, falls back to calling
+    check_key() for every key.
+    """
+
+    spec = compile_spec(spec)
+    if context is None:
+        context = EvaluationContext()
+    keys = list(keys)
+    if len(keys) < NUMPY_MIN_KEYS or load_numpy() is None:
+        return [check_key(k, spec, context) for k in keys]
+    if not keys:
+        return []
+    np = load_numpy()
+
+    # 1. flatten primary keys and subkeys into record arrays
+    types_mask = 0
+    for t in spec.subkey_types:
+        types_mask |= CAPS_BITS[t]
+
+    key_index = []
+    is_primary = []
+    algo = []
+    length = []
+    curve_ok = []
+    has_exp = []
+    exp_us = []
+    caps = []
+    caps_len = []
+    sk_validity = []
+    # keys that need to be checked in Python regardless of rules
+    dirty = np.zeros(len(keys), dtype=bool)
+
+    for i, k in enumerate(keys):
+        if k.validity in BAD_KEY_VALIDITY or k.overflow is not None:
+            dirty[i] = True
+        for j, sk in enumerate((k,) + tuple(k.subkeys)):
+            key_index.append(i)
+            is_primary.append(j == 0)
+            algo.append(sk.key_algo)
+            length.append(sk.key_length)
+            curve_ok.append(sk.curve in ECC_CURVES)
+            if sk.expiration_date is None:
+                has_exp.append(False)
+                exp_us.append(0)
+            else:
+                has_exp.append(True)
+                exp_us.append(encode_date(sk.expiration_date))
+            caps.append(caps_bits(sk.key_caps))
+            caps_len.append(len(sk.key_caps))
+            sk_validity.append(SUBKEY_VALIDITY.get(sk.validity,
+                                                   SUBKEY_VALID))
+
+        # UID checks are string processing anyway
+        if check_uids(k, spec):
+            dirty[i] = True
+
+    key_index = np.array(key_index, dtype=np.intp)
+    is_primary = np.array(is_primary, dtype=bool)
+    algo = np.array(algo, dtype=np.int32)
+    length = np.array(length, dtype=np.int64)
+    curve_ok = np.array(curve_ok, dtype=bool)
+    has_exp = np.array(has_exp, dtype=bool)
+    exp_us = np.array(exp_us, dtype=np.int64)
+    caps = np.array(caps, dtype=np.int32)
+    caps_len = np.array(caps_len, dtype=np.int32)
+    sk_validity = np.array(sk_validity, dtype=np.int8)
+
+    # 2. evaluate rules
+    algo_codes = algo_verdicts(spec, algo, length, curve_ok)
+    cutoffs = context.cutoffs(spec)
+    expire_codes = np.where(is_primary,
+            expire_verdicts(spec, cutoffs, 'key', has_exp, exp_us),
+            expire_verdicts(spec, cutoffs, 'subkey', has_exp, exp_us))
+
+    # 3. find keys that have any issues
+    # subkeys that are checked at all
+    checked = is_primary | ((caps & types_mask) != 0)
+    live = checked & (is_primary | (sk_validity != SUBKEY_SKIPPED))
+    deprecated = np.isin(algo, [int(x) for x in RSA_DEPRECATED_ALGOS])
+    fired = live & ((algo_codes != ALGO_OK) | (expire_codes != EXPIRE_OK)
+                    | deprecated)
+    fired |= checked & ~is_primary & (sk_validity == SUBKEY_INVALID)
+    if spec.subkey_multipurpose:
+        fired |= live & ~is_primary & (caps_len > 1)
+    dirty |= np.bincount(key_index[fired], minlength=len(keys)) > 0
+
+    if spec.subkey_none:
+        for t in spec.subkey_types:
+            has_type = live & ~is_primary & (caps == CAPS_BITS[t]) & (
+                    caps_len == 1)
+            dirty |= np.bincount(key_index[has_type],
+                                 minlength=len(keys)) == 0
+
+    # 4. materialize issues for keys that need it
+    out = [[] for k in keys]
+    if not dirty.any():
+        return out
+
+    starts = np.searchsorted(key_index, np.arange(len(keys)))
+    ends = np.append(starts[1:], len(key_index))
+    verdicts = np.stack((algo_codes, expire_codes), axis=1)
+    for i in np.flatnonzero(dirty).tolist():
+        out[i] = verdict_key_issues(keys[i], spec, context,
+                verdicts[starts[i]:ends[i]].tolist())
+    return out
+
+
+def check_keys_specs(keys, specs, context=None):
+    """
+    Check all keys in @keys against all @specs.  Returns a list
+    of results for every spec, each being a list of results for every
+    key.
+    """
+
+    specs = [compile_spec(spec) for spec in specs]
+    if context is None:
+        context = EvaluationContext()
+    if len(specs) == 1:
+        return [check_keys(keys, specs[0], context)]
+
+    # check every key against all specs in one pass, then group
+    # the results per spec
+    results = [[] for spec in specs]
+    for k in keys:
+        for spec_results, keyret in zip(results,
+                                        check_key_specs(k, specs, context)):
+            spec_results.append(keyret)
+    return results
+
+
+class CheckedKeys(object):
+    """
+    Results of checking keys that are available immediately,
+    as returned by submit_keys_specs().
+    """
+
+    def __init__(self, results):
+        self.results = results
+
+    def ready(self):
+        """
+        Return True if the results are available.
+        """
+
+        return True
+
+    def get(self):
+        """
+        Return the results, in the same form as check_keys_specs().
+        """
+
+        return self.results
+
+
+def submit_keys_specs(keys, specs, context=None):
+    """
+    Check all keys in @keys against all @specs, like check_keys_specs().
+    Returns an object providing ready() and get() methods, the same
+    as ParallelChecker.submit().
+    """
+
+    return CheckedKeys(check_keys_specs(keys, specs, context))
+
+
+CAPS_BITS = {'s': 1, 'e': 2, 'a': 4, 'c': 8}
+_caps_cache = {}
+
+
+def caps_bits(key_caps):
+    ret = _caps_cache.get(key_caps)
+    if ret is None:
+        ret = 0
+        for c in key_caps:
+            ret |= CAPS_BITS.get(c, 0)
+        _caps_cache[key_caps] = ret
+    return ret
+
+
+def algo_verdicts(spec, algo, length, curve_ok):
+    """
+    Vectorized equivalent of classify_algo().
+    """
+
+    np = load_numpy()
+    algo = np.where(np.isin(algo, [int(x) for x in RSA_DEPRECATED_ALGOS]),
+                    int(KeyAlgo.RSA), algo)
+    is_dsa = np.isin(algo, [int(x) for x in DSA_ALGOS])
+    is_rsa = algo == KeyAlgo.RSA
+    is_ecc = np.isin(algo, [int(x) for x in ECC_ALGOS])
+
+    conds = []
+    choices = []
+    if spec.algo_dsa == FAIL:
+        conds.append(is_dsa)
+        choices.append(ALGO_DSA)
+    else:
+        conds.append(is_dsa & (length < spec.dsa_minlength))
+        choices.append(ALGO_DSA_TOOSHORT)
+        if spec.algo_dsa == WARN:
+            conds.append(is_dsa)
+            choices.append(ALGO_DSA_DISCOURAGED)
+    conds += [is_rsa & (length < spec.rsa_minlength),
+              is_rsa & (length < spec.rsa_recommended)]
+    choices += [ALGO_RSA_TOOSHORT, ALGO_RSA_SHORT]
+    if spec.algo_ecc == FAIL:
+        conds.append(is_ecc)
+        choices.append(ALGO_ECC)
+    else:
+        conds.append(is_ecc & ~curve_ok)
+        choices.append(ALGO_ECC_INVALID)
+    if spec.algo_invalid:
+        conds.append(~(is_dsa | is_rsa | is_ecc))
+        choices.append(ALGO_INVALID)
+
+    return np.select(conds, choices, ALGO_OK)
+
+
+def expire_verdicts(spec, cutoffs, key_type, has_exp, exp_us):
+    """
+    Vectorized equivalent of expire_verdict().
+    """
+
+    np = load_numpy()
+    rules = getattr(spec, key_type)
+    if rules.expire_max is None and rules.expire_recommended is None:
+        return np.full(has_exp.shape, EXPIRE_OK)
+
+    long_cutoffs = getattr(cutoffs, key_type)
+    conds = [~has_exp]
+    choices = [EXPIRE_NONE]
+    if long_cutoffs.fail is not None:
+        conds.append(exp_us >= encode_date(long_cutoffs.fail))
+        choices.append(EXPIRE_LONG_FAIL)
+    if long_cutoffs.warn is not None:
+        conds.append(exp_us >= encode_date(long_cutoffs.warn))
+        choices.append(EXPIRE_LONG_WARN)
+    if cutoffs.short_fail is not None:
+        conds.append(exp_us < encode_date(cutoffs.short_fail))
+        choices.append(EXPIRE_SHORT_FAIL)
+    if cutoffs.short_warn is not None:
+        conds.append(exp_us < encode_date(cutoffs.short_warn))
+        choices.append(EXPIRE_SHORT_WARN)
+
+    return np.select(conds, choices, EXPIRE_OK)
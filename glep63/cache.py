@@ -0,0 +1,309 @@
+# glep63-check -- persistent cache of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import bisect
+import collections
+import json
+import os
+import os.path
+import sqlite3
+import time
+
+from glep63 import (__version__,)
+from glep63.batch import (CheckedKeys, check_keys_specs, submit_keys_specs)
+from glep63.check import (verdict_instants,)
+from glep63.serialize import (key_digest, encode_date, encode_issues,
+                              decode_issues)
+
+
+DEFAULT_MAX_ENTRIES = 100000
+# seconds to wait for other processes using the database
+DEFAULT_TIMEOUT = 5.0
+# version of stored results, results stored by a different version
+# are discarded; bump CACHE_FORMAT if the rules or the encoding
+# of results change without a release
+CACHE_FORMAT = 1
+CACHE_VERSION = '{}:{}'.format(CACHE_FORMAT, __version__)
+
+
+def default_cache_path():
+    """
+    Return the default path to the result cache database.
+    """
+
+    cache_home = os.environ.get('XDG_CACHE_HOME',
+                                os.path.expanduser('~/.cache'))
+    return os.path.join(cache_home, 'glep63-check', 'results.sqlite')
+
+
+class ResultCache(object):
+    """
+    Persistent cache of check results.  Results are stored per key
+    digest and spec fingerprint, along with the interval of time
+    in which they remain valid (i.e. until the next instant
+    at which an expiration rule changes its verdict).
+
+    If the database can not be used (e.g. because another process
+    keeps it locked for longer than @timeout seconds), the cache
+    is disabled, and error is set to the exception raised.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES,
+                 timeout=DEFAULT_TIMEOUT):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=timeout)
+        try:
+            self.db.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    digest TEXT NOT NULL,
+                    spec TEXT NOT NULL,
+                    valid_after INTEGER,
+                    valid_until INTEGER,
+                    result TEXT NOT NULL,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (digest, spec))''')
+            self.db.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT NOT NULL)''')
+            # results of other versions may be different
+            row = self.db.execute(
+                "SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != CACHE_VERSION:
+                self.db.execute('DELETE FROM results')
+                self.db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (CACHE_VERSION,))
+            self.db.commit()
+        except sqlite3.Error:
+            self.db.close()
+            raise
+        self.max_entries = max_entries
+        self.stats = collections.Counter()
+        self.now = int(time.time())
+        self.error = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, k, spec, context, digest=None):
+        """
+        Return cached result of checking key @k against compiled @spec
+        in EvaluationContext @context, or None if it is not available.
+        """
+
+        if self.error is not None:
+            return None
+        if digest is None:
+            digest = key_digest(k)
+        try:
+            row = self.db.execute('''
+                SELECT valid_after, valid_until, result FROM results
+                WHERE digest = ? AND spec = ?''',
+                (digest, spec.fingerprint)).fetchone()
+        except sqlite3.Error as e:
+            self.disable(e)
+            return None
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+
+        valid_after, valid_until, result = row
+        now = encode_date(context.now)
+        if ((valid_after is not None and now <= valid_after)
+                or (valid_until is not None and now > valid_until)):
+            self.stats['misses'] += 1
+            self.stats['stale'] += 1
+            return None
+
+        try:
+            self.db.execute('''
+                UPDATE results SET last_used = ?
+                WHERE digest = ? AND spec = ?''',
+                (self.now, digest, spec.fingerprint))
+        except sqlite3.Error as e:
+            self.disable(e)
+        self.stats['hits'] += 1
+        return decode_issues(k, json.loads(result))
+
+    def put(self, k, spec, context, result, digest=None):
+        """
+        Store @result of checking key @k against compiled @spec
+        in EvaluationContext @context.
+        """
+
+        if self.error is not None:
+            return
+        if digest is None:
+            digest = key_digest(k)
+        instants = verdict_instants(k, spec)
+        pos = bisect.bisect_left(instants, context.now)
+        valid_after = encode_date(instants[pos-1]) if pos > 0 else None
+        valid_until = encode_date(instants[pos]) if pos < len(instants) else None
+
+        try:
+            self.db.execute('''
+                INSERT OR REPLACE INTO results
+                VALUES (?, ?, ?, ?, ?, ?)''',
+                (digest, spec.fingerprint, valid_after, valid_until,
+                 json.dumps(encode_issues(k, result)), self.now))
+        except sqlite3.Error as e:
+            self.disable(e)
+            return
+        self.stats['stores'] += 1
+
+    def commit(self):
+        """
+        Commit the changes, releasing the database lock for other
+        processes.
+        """
+
+        if self.error is not None:
+            return
+        try:
+            self.db.commit()
+        except sqlite3.Error as e:
+            self.disable(e)
+
+    def disable(self, e):
+        """
+        Stop using the cache after database error @e.  Uncommitted
+        changes are discarded.
+        """
+
+        self.error = e
+        try:
+            self.db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """
+        Evict least recently used entries over the size limit, and close
+        the database.
+        """
+
+        try:
+            if self.error is None:
+                count, = self.db.execute(
+                    'SELECT COUNT(*) FROM results').fetchone()
+                if count > self.max_entries:
+                    cur = self.db.execute('''
+                        DELETE FROM results WHERE rowid IN (
+                            SELECT rowid FROM results
+                            ORDER BY last_used LIMIT ?)''',
+                        (count - self.max_entries,))
+                    self.stats['evictions'] += cur.rowcount
+                self.db.commit()
+        except sqlite3.Error as e:
+            self.disable(e)
+        finally:
+            self.db.close()
+
+    def format_stats(self):
+        return ('result cache: {hits} hits, {misses} misses ({stale} stale), '
+                '{stores} stored, {evictions} evicted'
+                .format(**dict((k, self.stats[k]) for k in
+                               ('hits', 'misses', 'stale', 'stores',
+                                'evictions'))))
+
+
+class CachedKeys(object):
+    """
+    Results of checking keys via submit_keys_cached(), that are stored
+    into the cache once they are available.
+    """
+
+    def __init__(self, keys, specs, context, cache, digests, results,
+                 pending):
+        self.keys = keys
+        self.specs = specs
+        self.context = context
+        self.cache = cache
+        self.digests = digests
+        self.results = results
+        # list of (key indexes, spec indexes, submitted check)
+        self.pending = pending
+
+    def ready(self):
+        """
+        Return True if the results are available.
+        """
+
+        return all(p.ready() for indexes, spec_indexes, p in self.pending)
+
+    def get(self):
+        """
+        Wait for the results, store them in the cache and return them
+        in the same form as check_keys_specs().
+        """
+
+        for indexes, spec_indexes, p in self.pending:
+            for j, spec_results in zip(spec_indexes, p.get()):
+                for i, result in zip(indexes, spec_results):
+                    self.results[j][i] = result
+                    self.cache.put(self.keys[i], self.specs[j],
+                                   self.context, result, self.digests[i])
+        self.pending = []
+        self.cache.commit()
+        return self.results
+
+
+def submit_keys_cached(keys, specs, context, cache,
+                       submit=submit_keys_specs):
+    """
+    Check @keys against all compiled @specs, reusing results
+    from ResultCache @cache where possible.  Returns an object providing
+    ready() and get() methods, like submit_keys_specs().
+
+    @submit is called as submit(keys, specs, context) to start checking
+    the keys missing from the cache.
+    """
+
+    results = [[None] * len(keys) for spec in specs]
+    missing = collections.defaultdict(list)
+    digests = [key_digest(k) for k in keys]
+
+    for i, k in enumerate(keys):
+        for j, spec in enumerate(specs):
+            result = cache.get(k, spec, context, digests[i])
+            if result is None:
+                missing[i].append(j)
+            else:
+                results[j][i] = result
+    # do not keep the database locked while checking
+    cache.commit()
+
+    # group keys by the specs they are missing
+    by_specs = collections.defaultdict(list)
+    for i, spec_indexes in missing.items():
+        by_specs[tuple(spec_indexes)].append(i)
+
+    pending = []
+    for spec_indexes, indexes in by_specs.items():
+        pending.append((indexes, spec_indexes,
+                        submit([keys[i] for i in indexes],
+                               [specs[j] for j in spec_indexes], context)))
+    return CachedKeys(keys, specs, context, cache, digests, results,
+                      pending)
+
+
+def check_keys_cached(keys, specs, context, cache,
+                      checker=check_keys_specs):
+    """
+    Check @keys against all compiled @specs, reusing results
+    from ResultCache @cache where possible.  Returns a list of results
+    for every spec, each being a list of results for every key.
+
+    @checker is called as checker(keys, specs, context) to check
+    the keys missing from the cache.
+    """
+
+    def submit(keys, specs, context):
+        return CheckedKeys(checker(keys, specs, context))
+
+    return submit_keys_cached(keys, specs, context, cache, submit).get()
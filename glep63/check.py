@@ -2,139 +2,422 @@
 # (c) 2018-2019 Michał Górny
 # Released under the terms of 2-clause BSD license.
 
+import collections
 import datetime
-import email.utils
 import functools
+import math
+import re
 
-from glep63.base import (FAIL, WARN, KeyAlgo, Validity, KeyIssue,
-        SubKeyIssue, SubKeyWarning, UIDIssue)
+from glep63.base import (FAIL, WARN, KeyAlgo, Validity, Description,
+        KeyIssue, SubKeyIssue, SubKeyWarning, UIDIssue)
+from glep63.specs import (compile_spec,)
 
 
-def check_subkey(k, spec, key_type, issue_params):
+# verdicts of the key algorithm/length check
+(ALGO_OK, ALGO_DSA, ALGO_DSA_TOOSHORT, ALGO_DSA_DISCOURAGED,
+ ALGO_RSA_TOOSHORT, ALGO_RSA_SHORT, ALGO_ECC, ALGO_ECC_INVALID,
+ ALGO_INVALID) = range(9)
+
+# verdicts of the key expiration check
+(EXPIRE_OK, EXPIRE_NONE, EXPIRE_LONG_FAIL, EXPIRE_LONG_WARN,
+ EXPIRE_SHORT_FAIL, EXPIRE_SHORT_WARN) = range(6)
+
+RSA_DEPRECATED_ALGOS = (KeyAlgo.RSA_SIGN_ONLY, KeyAlgo.RSA_ENCRYPT_ONLY)
+DSA_ALGOS = (KeyAlgo.DSA, KeyAlgo.ELGAMAL)
+ECC_ALGOS = (KeyAlgo.ECDH, KeyAlgo.ECDSA, KeyAlgo.EDDSA)
+ECC_CURVES = ('cv25519', 'ec25519', 'ed25519')
+
+# long descriptions of issues
+DESC_RSA_DEPRECATED = Description(
+    'Sign-only/encrypt-only RSA keys are deprecated')
+DESC_DSA_DISALLOWED = Description(
+    'DSA keys are disallowed (RSA is recommended)')
+DESC_DSA_DISCOURAGED = Description(
+    'DSA keys are discouraged (RSA is recommended)')
+DESC_ECC_DISALLOWED = Description(
+    'ECC keys are disallowed (RSA is recommended)')
+DESC_ALGO_UNEXPECTED = Description('Unexpected key algorithm')
+DESC_KEY_INVALID = Description('Public key is invalid')
+DESC_KEY_REVOKED = Description('Public key has been revoked')
+DESC_KEY_EXPIRED = Description('Public key has expired')
+DESC_SUBKEY_INVALID = Description('Subkey is invalid')
+DESC_UID_INVALID = Description('UID is invalid')
+DESC_UID_NOGENTOO = Description('@gentoo.org e-mail not in key UIDs')
+DESC_SUBKEY_NONE = {
+    's': Description('Having a dedicated signing subkey is required'),
+    'e': Description('Having a dedicated encryption subkey is required'),
+}
+
+# templates for long descriptions with arguments
+TEMPLATE_LIMIT = ('Key exceeds the processing limit on {}, '
+                  'remaining data skipped (flooded key?)')
+TEMPLATE_DSA_TOOSHORT = 'DSA key too short (has {} bits, should be {} bits)'
+TEMPLATE_RSA_TOOSHORT = (
+    'RSA key too short (has {} bits, should be at least {} bits)')
+TEMPLATE_RSA_SHORT = 'RSA key short (has {} bits, {} bits recommended)'
+TEMPLATE_ECC_INVALID = 'ECC curve {} disallowed (only Curve 25519 supported)'
+TEMPLATE_EXPIRE_NONE = 'No expiration date on public key ({})'
+TEMPLATE_EXPIRE_TOO_LONG = 'Expiration date is too long (is {}, {})'
+TEMPLATE_EXPIRE_LONG = 'Expiration date is long (is {}, {})'
+TEMPLATE_EXPIRE_TOO_SHORT = (
+    'Expiration date is too close, please renew (is {}, less than {})')
+TEMPLATE_EXPIRE_SHORT = (
+    'Expiration date is close, please renew (is {}, less than {})')
+TEMPLATE_MULTIPURPOSE = (
+    'Subkey has multiple capabilities enabled (has: [{}]; use dedicated subkeys!)')
+
+
+# absolute expiration cut-offs for a spec: a key expiring at or after
+# 'fail'/'warn' expires too late, a key expiring before 'short_fail'
+# or 'short_warn' expires too soon
+LongCutoffs = collections.namedtuple('LongCutoffs', ('fail', 'warn'))
+ExpireCutoffs = collections.namedtuple('ExpireCutoffs',
+    ('key', 'subkey', 'short_fail', 'short_warn'))
+
+
+class EvaluationContext(object):
+    """
+    Evaluation context for a single run.  It holds the reference time
+    (read once) and the absolute expiration cut-offs of specs relative
+    to it, so that every expiration rule is a single comparison.
+    """
+
+    def __init__(self, now=None):
+        if now is None:
+            now = datetime.datetime.utcnow()
+        self.now = now
+        self._cutoffs = {}
+
+    def cutoffs(self, spec):
+        """
+        Return ExpireCutoffs for compiled @spec.
+        """
+        ret = self._cutoffs.get(spec.fingerprint)
+        if ret is None:
+            def shift(offset):
+                if offset is None:
+                    return None
+                return self.now + offset
+
+            offsets = expire_offsets(spec)
+            ret = ExpireCutoffs(
+                LongCutoffs(*map(shift, offsets.key)),
+                LongCutoffs(*map(shift, offsets.subkey)),
+                shift(offsets.short_fail),
+                shift(offsets.short_warn))
+            self._cutoffs[spec.fingerprint] = ret
+        return ret
+
+
+def expire_offsets(spec):
+    """
+    Return ExpireCutoffs for compiled @spec, relative to now (i.e. as
+    timedeltas that need to be added to the current time).
+    """
+
+    def long_offset(days):
+        # earliest offset with timedelta.days > days
+        if days is None:
+            return None
+        return datetime.timedelta(days=math.floor(days) + 1)
+
+    def short_offset(days):
+        # earliest offset with timedelta.days >= days
+        if days is None:
+            return None
+        return datetime.timedelta(days=math.ceil(days))
+
+    return ExpireCutoffs(
+        LongCutoffs(long_offset(spec.key.expire_max),
+                    long_offset(spec.key.expire_recommended)),
+        LongCutoffs(long_offset(spec.subkey.expire_max),
+                    long_offset(spec.subkey.expire_recommended)),
+        short_offset(spec.expire_short_fail),
+        short_offset(spec.expire_short_warn))
+
+
+def verdict_instants(k, spec):
+    """
+    Return a sorted list of instants at which the result of checking
+    key @k against compiled @spec can change.  The result is the same
+    for all times between two consecutive instants: for t1 < now <= t2.
+    """
+
+    offsets = expire_offsets(spec)
+    out = set()
+    for i, sk in enumerate([k] + list(k.subkeys)):
+        key_type = 'subkey' if i else 'key'
+        rules = getattr(spec, key_type)
+        if sk.expiration_date is None or (rules.expire_max is None
+                and rules.expire_recommended is None):
+            continue
+        for o in getattr(offsets, key_type) + (offsets.short_fail,
+                                               offsets.short_warn):
+            if o is not None:
+                out.add(sk.expiration_date - o)
+    return sorted(out)
+
+
+# key algorithm families (independent of spec)
+FAMILY_OTHER, FAMILY_RSA, FAMILY_DSA, FAMILY_ECC = range(4)
+
+
+def algo_family(key_algo):
+    if key_algo in RSA_DEPRECATED_ALGOS or key_algo == KeyAlgo.RSA:
+        return FAMILY_RSA
+    elif key_algo in DSA_ALGOS:
+        return FAMILY_DSA
+    elif key_algo in ECC_ALGOS:
+        return FAMILY_ECC
+    return FAMILY_OTHER
+
+
+def algo_verdict(spec, family, key_length, curve):
+    """
+    Return the ALGO_* verdict for key of algorithm @family, @key_length
+    and @curve.
+    """
+
+    if family == FAMILY_DSA:
+        if spec.algo_dsa == FAIL:
+            return ALGO_DSA
+        elif key_length < spec.dsa_minlength:
+            return ALGO_DSA_TOOSHORT
+        elif spec.algo_dsa == WARN:
+            return ALGO_DSA_DISCOURAGED
+    elif family == FAMILY_RSA:
+        if key_length < spec.rsa_minlength:
+            return ALGO_RSA_TOOSHORT
+        elif key_length < spec.rsa_recommended:
+            return ALGO_RSA_SHORT
+    elif family == FAMILY_ECC:
+        if spec.algo_ecc == FAIL:
+            return ALGO_ECC
+        elif curve not in ECC_CURVES:
+            return ALGO_ECC_INVALID
+    elif spec.algo_invalid:
+        return ALGO_INVALID
+    return ALGO_OK
+
+
+def expire_verdict(spec, cutoffs, key_type, expiration_date):
+    """
+    Return the EXPIRE_* verdict for key of @key_type expiring
+    at @expiration_date (None if not expiring).  @cutoffs are
+    the ExpireCutoffs for @spec.
+    """
+
+    rules = getattr(spec, key_type)
+    if rules.expire_max is None and rules.expire_recommended is None:
+        return EXPIRE_OK
+    if expiration_date is None:
+        return EXPIRE_NONE
+
+    long_cutoffs = getattr(cutoffs, key_type)
+    if (long_cutoffs.fail is not None
+            and expiration_date >= long_cutoffs.fail):
+        return EXPIRE_LONG_FAIL
+    elif (long_cutoffs.warn is not None
+            and expiration_date >= long_cutoffs.warn):
+        return EXPIRE_LONG_WARN
+    elif (cutoffs.short_fail is not None
+            and expiration_date < cutoffs.short_fail):
+        return EXPIRE_SHORT_FAIL
+    elif (cutoffs.short_warn is not None
+            and expiration_date < cutoffs.short_warn):
+        return EXPIRE_SHORT_WARN
+    return EXPIRE_OK
+
+
+def classify_algo(k, spec):
+    """
+    Return the ALGO_* verdict for key algorithm/length of @k.
+    """
+
+    return algo_verdict(spec, algo_family(k.key_algo), k.key_length,
+                        k.curve)
+
+
+def classify_expire(k, spec, key_type, context):
+    """
+    Return the EXPIRE_* verdict for expiration date of @k, relative
+    to the time of EvaluationContext @context.
+    """
+
+    return expire_verdict(spec, context.cutoffs(spec), key_type,
+                          k.expiration_date)
+
+
+def subkey_issues(k, spec, key_type, issue_params, algo, expire):
+    """
+    Create issues for key @k from verdicts @algo and @expire.
+    """
+
     out = []
 
-    issue_cls = functools.partial(getattr(FAIL, key_type), *issue_params)
-    warning_cls = functools.partial(getattr(WARN, key_type), *issue_params)
+    rules = getattr(spec, key_type)
+    issue_cls = rules.issue_cls
+    warning_cls = rules.warning_cls
 
     # 1. key algo/length
-    if k.key_algo in (KeyAlgo.RSA_SIGN_ONLY, KeyAlgo.RSA_ENCRYPT_ONLY):
-        out.append(warning_cls('algo:rsa:deprecated_only',
-            'Sign-only/encrypt-only RSA keys are deprecated'))
-        # set to common value for simplicity
-        k.key_algo = KeyAlgo.RSA
-
-    if k.key_algo in (KeyAlgo.DSA, KeyAlgo.ELGAMAL):
-        dsa_key = spec.get('algo:dsa')
-        if dsa_key == FAIL:
-            out.append(issue_cls('algo:dsa',
-                'DSA keys are disallowed (RSA is recommended)'))
-        elif k.key_length < spec.get('algo:dsa:minlength', 0):
-            out.append(issue_cls('algo:dsa:tooshort',
-                'DSA key too short (has {} bits, should be {} bits)'
-                .format(k.key_length, spec['algo:dsa:minlength'])))
-        elif dsa_key == WARN:
-            out.append(warning_cls('algo:dsa:discouraged',
-                'DSA keys are discouraged (RSA is recommended)'))
-    elif k.key_algo == KeyAlgo.RSA:
-        rsa_key = spec.get('algo:rsa')
-        # we currently don't have to implement forbidding RSA ;-)
-        assert not rsa_key
-        if k.key_length < spec.get('algo:rsa:minlength', 0):
-            out.append(issue_cls('algo:rsa:tooshort',
-                'RSA key too short (has {} bits, should be at least {} bits)'
-                .format(k.key_length, spec['algo:rsa:minlength'])))
-        elif k.key_length < spec.get('algo:rsa:recommended', 0):
-            out.append(warning_cls('algo:rsa:short',
-                'RSA key short (has {} bits, {} bits recommended)'
-                .format(k.key_length, spec['algo:rsa:recommended'])))
-    elif k.key_algo in (KeyAlgo.ECDH, KeyAlgo.ECDSA, KeyAlgo.EDDSA):
-        ecc_key = spec.get('algo:ec25519')
-        if ecc_key == FAIL:
-            out.append(issue_cls('algo:ecc',
-                'ECC keys are disallowed (RSA is recommended)'))
-        else:
-            # warnings are not used at the moment
-            assert ecc_key is None
+    if k.key_algo in RSA_DEPRECATED_ALGOS:
+        out.append(warning_cls(*issue_params, 'algo:rsa:deprecated_only',
+            DESC_RSA_DEPRECATED))
 
-            if k.curve not in ('cv25519', 'ec25519', 'ed25519'):
-                out.append(issue_cls('algo:ecc:invalid',
-                    'ECC curve {} disallowed (only Curve 25519 supported)'
-                    .format(k.curve)))
-
-    elif spec.get('algo:invalid'):
-        cls = issue_cls if spec['algo:invalid'] == FAIL else warning_cls
-        out.append(issue_cls('algo:invalid',
-            'Unexpected key algorithm'))
+    if algo == ALGO_OK:
+        pass
+    elif algo == ALGO_DSA:
+        out.append(issue_cls(*issue_params, 'algo:dsa', DESC_DSA_DISALLOWED))
+    elif algo == ALGO_DSA_TOOSHORT:
+        out.append(issue_cls(*issue_params, 'algo:dsa:tooshort',
+            Description(TEMPLATE_DSA_TOOSHORT,
+                        (k.key_length, spec.dsa_minlength))))
+    elif algo == ALGO_DSA_DISCOURAGED:
+        out.append(warning_cls(*issue_params, 'algo:dsa:discouraged',
+            DESC_DSA_DISCOURAGED))
+    elif algo == ALGO_RSA_TOOSHORT:
+        out.append(issue_cls(*issue_params, 'algo:rsa:tooshort',
+            Description(TEMPLATE_RSA_TOOSHORT,
+                        (k.key_length, spec.rsa_minlength))))
+    elif algo == ALGO_RSA_SHORT:
+        out.append(warning_cls(*issue_params, 'algo:rsa:short',
+            Description(TEMPLATE_RSA_SHORT,
+                        (k.key_length, spec.rsa_recommended))))
+    elif algo == ALGO_ECC:
+        out.append(issue_cls(*issue_params, 'algo:ecc', DESC_ECC_DISALLOWED))
+    elif algo == ALGO_ECC_INVALID:
+        out.append(issue_cls(*issue_params, 'algo:ecc:invalid',
+            Description(TEMPLATE_ECC_INVALID,
+                        (k.curve,))))
+    elif algo == ALGO_INVALID:
+        cls = issue_cls if spec.algo_invalid == FAIL else warning_cls
+        out.append(cls(*issue_params, 'algo:invalid', DESC_ALGO_UNEXPECTED))
 
     # 2. key expiration
-    expire_max = spec.get('expire:max:{}'.format(key_type))
-    expire_recommended = spec.get('expire:recommended:{}'.format(key_type))
-    if expire_max is not None or expire_recommended is not None:
-        if expire_recommended is not None:
-            expire_str = ('<{} recommended, {} max'
-                    .format(expire_recommended, expire_max))
-        else:
-            expire_str = '{} max'.format(expire_max)
+    if expire == EXPIRE_OK:
+        pass
+    elif expire == EXPIRE_NONE:
+        cls = issue_cls if rules.expire_max is not None else warning_cls
+        out.append(cls(*issue_params, 'expire:none',
+            Description(TEMPLATE_EXPIRE_NONE,
+                        (rules.expire_str,))))
+    elif expire == EXPIRE_LONG_FAIL:
+        out.append(issue_cls(*issue_params, 'expire:long',
+            Description(TEMPLATE_EXPIRE_TOO_LONG,
+                        (k.expiration_date, rules.expire_str))))
+    elif expire == EXPIRE_LONG_WARN:
+        out.append(warning_cls(*issue_params, 'expire:long',
+            Description(TEMPLATE_EXPIRE_LONG,
+                        (k.expiration_date, rules.expire_str))))
+    elif expire == EXPIRE_SHORT_FAIL:
+        out.append(issue_cls(*issue_params, 'expire:short',
+            Description(TEMPLATE_EXPIRE_TOO_SHORT,
+                        (k.expiration_date, spec.expire_short_fail_str))))
+    elif expire == EXPIRE_SHORT_WARN:
+        out.append(warning_cls(*issue_params, 'expire:short',
+            Description(TEMPLATE_EXPIRE_SHORT,
+                        (k.expiration_date, spec.expire_short_warn_str))))
 
-        if k.expiration_date is None:
-            cls = issue_cls if expire_max is not None else warning_cls
-            out.append(cls('expire:none',
-                'No expiration date on public key ({})'.format(expire_str)))
-        else:
-            expire_left = k.expiration_date - datetime.datetime.utcnow()
-            if expire_max is not None and expire_left.days > expire_max.days:
-                out.append(issue_cls('expire:long',
-                    'Expiration date is too long (is {}, {})'
-                    .format(k.expiration_date, expire_str)))
-            elif (expire_recommended is not None
-                    and expire_left.days > expire_recommended.days):
-                out.append(warning_cls('expire:long',
-                    'Expiration date is long (is {}, {})'
-                    .format(k.expiration_date, expire_str)))
-            elif (spec.get('expire:short:fail') is not None
-                    and expire_left.days < spec['expire:short:fail'].days):
-                out.append(issue_cls('expire:short',
-                    'Expiration date is too close, please renew (is {}, less than {})'
-                    .format(k.expiration_date, spec['expire:short:fail'])))
-            elif (spec.get('expire:short:warn') is not None
-                    and expire_left.days < spec['expire:short:warn'].days):
-                out.append(warning_cls('expire:short',
-                    'Expiration date is close, please renew (is {}, less than {})'
-                    .format(k.expiration_date, spec['expire:short:warn'])))
+    return out
+
+
+def check_subkey(k, spec, key_type, issue_params, context=None):
+    spec = compile_spec(spec)
+    if context is None:
+        context = EvaluationContext()
+    return subkey_issues(k, spec, key_type, issue_params,
+            classify_algo(k, spec),
+            classify_expire(k, spec, key_type, context))
+
+
+def check_key(k, spec, context=None):
+    """
+    Check key @k against @spec.  @context is the EvaluationContext
+    to use; if None, a new one is created for the current time.
+    """
+
+    if context is None:
+        context = EvaluationContext()
+    return verdict_key_issues(k, compile_spec(spec), context)
+
+
+def check_key_specs(k, specs, context=None):
+    """
+    Check key @k against all specs in @specs in a single pass.  Returns
+    a list of results, one for every spec.
+
+    The spec-independent work (algorithm classification and UID
+    parsing) is done only once.
+    """
+
+    specs = [compile_spec(spec) for spec in specs]
+    if context is None:
+        context = EvaluationContext()
+    records = [(algo_family(sk.key_algo), sk.key_length, sk.curve,
+                sk.expiration_date)
+               for sk in [k] + list(k.subkeys)]
+    uids = None
+    if any(uid_rules_selected(spec) for spec in specs):
+        uids = uid_facts(k)
 
+    out = []
+    for spec in specs:
+        cutoffs = context.cutoffs(spec)
+        verdicts = [(algo_verdict(spec, family, key_length, curve),
+                     expire_verdict(spec, cutoffs,
+                                    'subkey' if i else 'key',
+                                    expiration_date))
+                    for i, (family, key_length, curve, expiration_date)
+                    in enumerate(records)]
+        out.append(verdict_key_issues(k, spec, context, verdicts, uids))
     return out
 
 
-def check_key(k, spec):
+def verdict_key_issues(k, spec, context, verdicts=None, uids=None):
+    """
+    Check key @k against compiled @spec in EvaluationContext @context.
+    @verdicts can provide precomputed (algo, expire) verdicts
+    for the primary key (at index 0) and the subkeys (following it).
+    If it is None, verdicts are computed as necessary.  @uids can
+    likewise provide precomputed uid_facts().
+    """
+
     out = []
 
     # 0. check key validity (only for whole key)
     if k.validity == Validity.INVALID:
-        out.append(KeyIssue(k, 'validity:invalid',
-            'Public key is invalid'))
-        return out
+        out.append(KeyIssue(k, 'validity:invalid', DESC_KEY_INVALID))
+        return selected_issues(spec, out)
     elif k.validity == Validity.REVOKED:
-        out.append(KeyIssue(k, 'validity:revoked',
-            'Public key has been revoked'))
-        return out
+        out.append(KeyIssue(k, 'validity:revoked', DESC_KEY_REVOKED))
+        return selected_issues(spec, out)
     elif k.validity == Validity.EXPIRED:
-        out.append(KeyIssue(k, 'validity:expired',
-            'Public key has expired'))
-        return out
+        out.append(KeyIssue(k, 'validity:expired', DESC_KEY_EXPIRED))
+        return selected_issues(spec, out)
+    # incomplete key can not be checked reliably
+    if k.overflow is not None:
+        out.append(KeyIssue(k, 'limit:{}'.format(k.overflow),
+            Description(TEMPLATE_LIMIT, (k.overflow,))))
+        return selected_issues(spec, out)
 
     # 1. check public key
-    out.extend(check_subkey(k, spec, 'key', (k,)))
+    if verdicts is not None:
+        out.extend(subkey_issues(k, spec, 'key', (k,), *verdicts[0]))
+    else:
+        out.extend(check_subkey(k, spec, 'key', (k,), context))
 
     # 2. check subkeys
     # (sadly, we can't be sure *which* subkey is used for Gentoo,
     #  so we complain about all of them)
     has_subkey_of_type = {'a': False, 'e': False, 's': False}
-    good_keys_by_type = {'a': [], 'e': [], 's': []}
-    for sk in k.subkeys:
+    has_good_key_of_type = {'a': False, 'e': False, 's': False}
+    # positions of subkey:expire:short issues in out, by key_caps
+    short_expire_by_type = {'e': [], 's': []}
+    for i, sk in enumerate(k.subkeys, 1):
         result = []
 
         # check only specified subkey types
-        for t in spec['__subkey_types__']:
+        for t in spec.subkey_types:
             assert t in ('s', 'e')
             if t in sk.key_caps:
                 break
@@ -144,61 +427,137 @@ def check_key(k, spec):
         # complain about invalid subkeys
         if sk.validity == Validity.INVALID:
             result.append(SubKeyIssue(k, sk, 'validity:invalid',
-                'Subkey is invalid'))
+                DESC_SUBKEY_INVALID))
         # skip expired and revoked subkeys
         if sk.validity in (Validity.REVOKED, Validity.EXPIRED):
             continue
 
-        if len(sk.key_caps) > 1 and spec.get('subkey:multipurpose'):
-            result.append(spec['subkey:multipurpose'].subkey(k, sk, 'subkey:multipurpose',
-                'Subkey has multiple capabilities enabled (has: [{}]; use dedicated subkeys!)'
-                .format(sk.key_caps)))
+        if len(sk.key_caps) > 1 and spec.subkey_multipurpose:
+            result.append(spec.subkey_multipurpose.subkey(k, sk, 'subkey:multipurpose',
+                Description(TEMPLATE_MULTIPURPOSE,
+                            (sk.key_caps,))))
         else:
             has_subkey_of_type[sk.key_caps] = True
 
-        result += check_subkey(sk, spec, 'subkey', (k, sk))
-        # check whether the subkey had any issues; if not, add it
-        # to the list of good subkeys
+        if verdicts is not None:
+            result += subkey_issues(sk, spec, 'subkey', (k, sk),
+                                    *verdicts[i])
+        else:
+            result += check_subkey(sk, spec, 'subkey', (k, sk), context)
+        # check whether the subkey had any issues; if not, mark
+        # its types as having a good subkey
+        good = True
         for r in result:
             if isinstance(r, SubKeyIssue):
-                break
-        else:
+                good = False
+                if (r.machine_desc == 'expire:short'
+                        and sk.key_caps in short_expire_by_type):
+                    short_expire_by_type[sk.key_caps].append(len(out))
+            out.append(r)
+        if good:
             for c in sk.key_caps:
-                good_keys_by_type[c].append(sk)
-        out += result
-
-    # make subkey:expire non-fatal if there is at least one good subkey
-    for t in spec['__subkey_types__']:
-        if good_keys_by_type[t]:
-            for i, r in enumerate(out):
-                if (isinstance(r, SubKeyIssue)
-                        and r.machine_desc == 'expire:short'
-                        and r.subkey.key_caps == t):
-                    out[i] = SubKeyWarning(*r)
-
-        if not has_subkey_of_type[t] and spec.get('subkey:none'):
-            out.append(spec['subkey:none'].key(k, 'subkey:none:{}'.format(t),
-                'Having a dedicated {} subkey is required'.format(
-                    'signing' if t == 's' else 'encryption')))
+                has_good_key_of_type[c] = True
+
+    for t in spec.subkey_types:
+        # make subkey:expire non-fatal if there is at least one good subkey
+        if has_good_key_of_type[t]:
+            for i in short_expire_by_type[t]:
+                out[i] = SubKeyWarning(*out[i])
+
+        if not has_subkey_of_type[t] and spec.subkey_none:
+            out.append(spec.subkey_none.key(k, 'subkey:none:{}'.format(t),
+                DESC_SUBKEY_NONE[t]))
 
     # 3. check UIDs
+    out += check_uids(k, spec, uids)
+
+    return selected_issues(spec, out)
+
+
+def selected_issues(spec, issues):
+    """
+    Return @issues restricted to the rules selected in compiled @spec.
+    """
+
+    if spec.rules is None:
+        return issues
+    return [i for i in issues if i.machine_desc in spec.rules]
+
+
+def check_uids(k, spec, facts=None):
+    """
+    Check UIDs of key @k against compiled @spec.  @facts can provide
+    precomputed result of uid_facts().
+    """
+
+    if not uid_rules_selected(spec):
+        return []
+
+    if facts is None:
+        facts = uid_facts(k)
+    out, has_gentoo_uid = facts
+
+    if not has_gentoo_uid and spec.uid_nogentoo:
+        out = out + [spec.uid_nogentoo.key(k, 'uid:nogentoo',
+            DESC_UID_NOGENTOO)]
+
+    return out
+
+
+def uid_rules_selected(spec):
+    """
+    Return whether any rules checking UIDs are selected in compiled
+    @spec.
+    """
+
+    return (spec.rules is None or bool(spec.uid_nogentoo)
+            or 'validity:invalid' in spec.rules)
+
+
+def uid_facts(k):
+    """
+    Process UIDs of key @k independently of spec.  Returns a tuple
+    of UID issues and a bool whether a @gentoo.org UID is present.
+    """
+
+    out = []
+
     # (require the @gentoo.org e-mail)
     has_gentoo_uid = False
     for u in k.uids:
         # complain about invalid UIDs
         if u.validity == Validity.INVALID:
-            out.append(UIDIssue(k, u, 'validity:invalid',
-                'UID is invalid'))
+            out.append(UIDIssue(k, u, 'validity:invalid', DESC_UID_INVALID))
         # skip expired and revoked UIDs
         if u.validity in (Validity.REVOKED, Validity.EXPIRED):
             continue
 
-        name, addr = email.utils.parseaddr(u.user_id)
-        if addr.endswith('@gentoo.org'):
+        if uid_email(u.user_id).endswith('@gentoo.org'):
             has_gentoo_uid = True
 
-    if not has_gentoo_uid and spec.get('uid:nogentoo'):
-        out.append(spec['uid:nogentoo'].key(k, 'uid:nogentoo',
-            '@gentoo.org e-mail not in key UIDs'))
+    return out, has_gentoo_uid
 
-    return out
+
+# 'Name <local@domain>' with no characters special to RFC 2822 parsing
+# in the name and only dot-separated atoms in the address
+_ATOM = r'[^\s"(),.:;<>@\[\]\\]+'
+_SIMPLE_UID_RE = re.compile(
+    r'[^"(),:;<>@\[\]\\]*<({0}(?:\.{0})*@{0}(?:\.{0})*)>'.format(_ATOM))
+
+
+@functools.lru_cache(maxsize=65536)
+def uid_email(user_id):
+    """
+    Return the e-mail address from UID string @user_id, or an empty
+    string if there is none.  The common 'Name <address>' form
+    is handled directly, anything else is passed to
+    email.utils.parseaddr().  Results are cached, so every UID is
+    parsed only once.
+    """
+
+    m = _SIMPLE_UID_RE.fullmatch(user_id)
+    if m is not None:
+        return m.group(1)
+    # imported here, as it is rarely needed and slow to import
+    import email.utils
+    return email.utils.parseaddr(user_id)[1]
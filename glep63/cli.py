@@ -2,23 +2,121 @@
 # (c) 2018 Michał Górny
 # Released under the terms of 2-clause BSD license.
 
+# modules needed only by some of the options (network access, reports,
+# parallel checking, forecasts...) are imported where they are used,
+# to keep the startup fast
+
 import argparse
 import collections
-import email.utils
-import shutil
-import tempfile
-import urllib.request
+import contextlib
+import datetime
+import functools
+import itertools
+import json
+import sqlite3
+import subprocess
+import sys
+
+from glep63.base import (FAIL,)
+from glep63.batch import (CHUNK_SIZE, submit_keys_specs)
+from glep63.cache import (DEFAULT_MAX_ENTRIES, ResultCache,
+                          default_cache_path, submit_keys_cached)
+from glep63.check import (EvaluationContext, check_key_specs)
+from glep63.gnupg import (DEFAULT_LIMITS, KeyLimits, SignatureError,
+                          copy_verified, iter_gnupg_colons, iter_gnupg_key)
+from glep63.output import (NDJSONOutput, TextOutput, format_issue)
+from glep63.snapshot import (NEW, RESOLVED, Snapshot, SnapshotDiff)
+from glep63.specs import (SPECS, DEFAULT_SPEC, drop_warnings, select_rules)
+from glep63.summary import (ERROR, WARNING, SummaryCounter, summarize_keys)
+
+
+# size of spooled output for additional specs kept in memory
+SPOOL_MAX_SIZE = 1024 * 1024
+# markers of text output lines when comparing against a snapshot
+DIFF_MARKERS = {NEW: '+', RESOLVED: '-'}
+
+# formats and filters for --output
+OUTPUT_FORMATS = ('text', 'machine', 'ndjson', 'summary', 'summary-json')
+OUTPUT_FILTERS = ('errors-only', 'warnings-as-errors', 'no-name',
+                  'ignore-extraneous-keys')
+
+OutputSink = collections.namedtuple('OutputSink',
+    ('format', 'filters', 'path'))
+
+
+def parse_output(arg):
+    """
+    Parse the --output argument @arg into OutputSink.
+    """
+
+    spec, sep, path = arg.partition('=')
+    if not sep or not path:
+        raise argparse.ArgumentTypeError(
+            'expected FORMAT[:FILTER,...]=PATH, got: {}'.format(arg))
+    fmt, _, filters = spec.partition(':')
+    if fmt not in OUTPUT_FORMATS:
+        raise argparse.ArgumentTypeError(
+            'unknown output format: {} (valid: {})'
+            .format(fmt, ', '.join(OUTPUT_FORMATS)))
+    filters = tuple(filters.split(',')) if filters else ()
+    for x in filters:
+        if x not in OUTPUT_FILTERS:
+            raise argparse.ArgumentTypeError(
+                'unknown output filter: {} (valid: {})'
+                .format(x, ', '.join(OUTPUT_FILTERS)))
+    return OutputSink(fmt, filters, path)
+
+
+def positive_int(arg):
+    """
+    Parse @arg as a positive integer.
+    """
+
+    try:
+        ret = int(arg)
+    except ValueError:
+        ret = 0
+    if ret < 1:
+        raise argparse.ArgumentTypeError(
+            'expected a positive integer, got: {}'.format(arg))
+    return ret
 
-from glep63.base import (FAIL, WARN)
-from glep63.check import (check_key,)
-from glep63.gnupg import (process_gnupg_colons, process_gnupg_key)
-from glep63.specs import (SPECS, DEFAULT_SPEC)
 
+def parse_timestamp(arg):
+    """
+    Parse ISO 8601 timestamp @arg for --as-of.  Timestamps with
+    a UTC offset are converted to naive UTC datetimes, the ones
+    without it are assumed to be UTC already.
+    """
 
-GoodKey = collections.namedtuple('GoodKey', ['key'])
+    # older Python versions do not accept "Z" in fromisoformat()
+    if arg.endswith(('Z', 'z')):
+        arg = arg[:-1] + '+00:00'
+    try:
+        ret = datetime.datetime.fromisoformat(arg)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            'invalid ISO 8601 timestamp: {}'.format(arg))
+    if ret.tzinfo is not None:
+        ret = ret.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ret
 
 
 def main():
+    """
+    Run glep63-check.  Returns the exit status: a combination of 1
+    if errors were found and 2 if warnings were (with -w), or 4
+    if the keys could not be loaded.
+    """
+
+    try:
+        return check_main()
+    except (subprocess.CalledProcessError, SignatureError) as e:
+        print('Unable to load keys: {}'.format(e), file=sys.stderr)
+        return 4
+
+
+def check_main():
     argp = argparse.ArgumentParser()
     act = argp.add_mutually_exclusive_group(required=True)
     act.add_argument('-a', '--all', action='store_true',
@@ -35,93 +133,639 @@ def main():
     act.add_argument('-K', '--keyring', nargs='+',
             help='Check all keys in specified keyrings (gpg --keyring syntax)')
 
-    argp.add_argument('-S', '--spec', choices=SPECS, default=DEFAULT_SPEC,
-            help='Spec to verify against')
+    argp.add_argument('--verify-signature', nargs='?', const='',
+            metavar='SIG_URL',
+            help='Verify the keyring fetched by -d/-D against a detached '
+                 'signature (default: keyring URL + ".sig")')
+    argp.add_argument('--verify-keyring', action='append', metavar='KEYRING',
+            help='Verify the signature using only keys in KEYRING '
+                 '(gpg --keyring syntax, can be specified multiple times, '
+                 'default: the default keyring)')
+    argp.add_argument('--verify-signer', action='append',
+            metavar='FINGERPRINT',
+            help='Accept only signatures made by the key with FINGERPRINT '
+                 '(or its subkey, can be specified multiple times)')
+    argp.add_argument('-S', '--spec', choices=SPECS, action='append',
+            help='Spec to verify against (can be specified multiple times, '
+                 'default: {})'.format(DEFAULT_SPEC))
+    argp.add_argument('--all-specs', action='store_true',
+            help='Verify against all known specs')
+    argp.add_argument('--only', action='append', metavar='PATTERN',
+            help='Check only rules matching PATTERN (e.g. "expire:*", '
+                 'matched against issue names, can be specified multiple '
+                 'times)')
+    argp.add_argument('--skip', action='append', metavar='PATTERN',
+            help='Do not check rules matching PATTERN (can be specified '
+                 'multiple times)')
+    argp.add_argument('--as-of', type=parse_timestamp,
+            metavar='TIMESTAMP',
+            help='Evaluate expiration dates as of TIMESTAMP (ISO 8601 '
+                 'format, UTC unless an offset is given, default: now)')
+    argp.add_argument('--forecast', type=int, metavar='DAYS',
+            help='Print changes in results expected over the next DAYS days '
+                 'instead of the current results')
+    argp.add_argument('--summary', nargs='?', const='table',
+            choices=('table', 'json'),
+            help='Print only counts of issues per spec, severity and type '
+                 '(as a table or as JSON)')
+    argp.add_argument('--save-snapshot', metavar='PATH',
+            help='Save the results into snapshot file PATH, for use with '
+                 '--diff-against in future runs')
+    argp.add_argument('--diff-against', metavar='SNAPSHOT',
+            help='Print only issues that were not present in SNAPSHOT '
+                 '(marked with "+") and issues from SNAPSHOT that were '
+                 'resolved (marked with "-"); the exit status reflects '
+                 'new issues only')
+    argp.add_argument('-j', '--jobs', type=positive_int, metavar='N',
+            help='Check keys using N worker processes and write reports '
+                 'using N threads (default: check keys in the main process, '
+                 'write reports using the default thread pool size)')
+    argp.add_argument('--no-cache', action='store_true',
+            help='Do not use the persistent result cache')
+    argp.add_argument('--cache-file', metavar='PATH',
+            help='Path to the result cache (default: {})'
+                 .format(default_cache_path()))
+    argp.add_argument('--cache-size', type=positive_int,
+            default=DEFAULT_MAX_ENTRIES, metavar='ENTRIES',
+            help='Maximum number of cached results (default: {})'
+                 .format(DEFAULT_MAX_ENTRIES))
+    argp.add_argument('--cache-stats', action='store_true',
+            help='Print result cache statistics to stderr')
+    for name, desc in (('uids', 'UIDs'), ('subkeys', 'subkeys'),
+                       ('records', 'colon-listing records'),
+                       ('bytes', 'bytes of colon listing')):
+        argp.add_argument('--max-{}'.format(name), type=int,
+                default=getattr(DEFAULT_LIMITS, name), metavar='N',
+                help='Stop processing keys with more than N {} and report '
+                     'them as failing (0 = unlimited, default: {})'
+                     .format(desc, getattr(DEFAULT_LIMITS, name)))
+    argp.add_argument('--fail-fast', action='store_true',
+            help='Stop at the first error (or warning, with -w) and print '
+                 'only it')
     argp.add_argument('-e', '--errors-only', action='store_true',
             help='Print only errors (skip warnings)')
     argp.add_argument('-i', '--ignore-extraneous-keys', action='store_true',
-            help='Skip developers who have at least one good key (by UID)')
+            help='Skip developers who have at least one good key (by UID); '
+                 'without --grouped-input, the results are kept in memory '
+                 'and printed after all keys are checked')
+    argp.add_argument('--format', choices=('text', 'ndjson'), default='text',
+            help='Output format: text (default) or ndjson (one JSON object '
+                 'per issue)')
+    argp.add_argument('--report-dir', metavar='DIR',
+            help='Instead of printing the results, write a report file '
+                 'for every developer with issues into DIR, including '
+                 'summaries of their keys')
+    argp.add_argument('--bug-bundle', metavar='PATH',
+            help='Instead of printing the results, write bug bundles '
+                 '(bug summary, URL for filing it and the report) for every '
+                 '@gentoo.org developer with issues into mailbox PATH')
+    argp.add_argument('--bug-bundle-format', choices=('mbox', 'maildir'),
+            default='mbox',
+            help='Mailbox format for --bug-bundle (default: mbox)')
+    argp.add_argument('--output', type=parse_output, action='append',
+            metavar='FORMAT[:FILTER,...]=PATH',
+            help='Write the results in FORMAT ({}) into PATH ("-" for '
+                 'stdout) instead of printing them, applying FILTERs ({}) '
+                 'in addition to the options given; can be specified '
+                 'multiple times, and the exit status combines '
+                 'the statuses of all outputs'
+                 .format(', '.join(OUTPUT_FORMATS),
+                         ', '.join(OUTPUT_FILTERS)))
+    argp.add_argument('--grouped-input', action='store_true',
+            help='Assume that keys of every developer are adjacent in input, '
+                 'so that -i can print results for every developer once '
+                 'the next one is seen')
     argp.add_argument('-m', '--machine-readable', action='store_true',
             help='Print only machine-readable data (skip human-readable desc)')
     argp.add_argument('-N', '--no-name', action='store_true',
             help='Print only e-mail addresses as UIDs')
+    argp.add_argument('-q', '--quiet', action='store_true',
+            help='Do not print anything, only return the exit status')
     argp.add_argument('-w', '--warnings-as-errors', action='store_true',
             help='Treat warnings as errors (return unsucessfully if any)')
 
     opts = argp.parse_args()
 
-    keys = []
+    if ((opts.verify_keyring is not None or opts.verify_signer is not None)
+            and opts.verify_signature is None):
+        argp.error('--verify-keyring and --verify-signer require '
+                   '--verify-signature')
+    if opts.fail_fast and (opts.ignore_extraneous_keys
+                           or opts.forecast is not None):
+        argp.error('--fail-fast can not be used with -i or --forecast')
+    if opts.summary is not None and (opts.ignore_extraneous_keys
+                                     or opts.forecast is not None
+                                     or opts.fail_fast):
+        argp.error('--summary can not be used with -i, --forecast '
+                   'or --fail-fast')
+    if opts.quiet and (opts.summary is not None
+                       or opts.forecast is not None):
+        argp.error('--quiet can not be used with --summary or --forecast')
+    if opts.format != 'text' and (opts.summary is not None
+                                  or opts.forecast is not None):
+        argp.error('--format can not be used with --summary or --forecast')
+    if ((opts.save_snapshot is not None or opts.diff_against is not None)
+            and (opts.summary is not None or opts.forecast is not None
+                 or opts.fail_fast)):
+        argp.error('--save-snapshot and --diff-against can not be used '
+                   'with --summary, --forecast or --fail-fast')
+    if opts.diff_against is not None and opts.ignore_extraneous_keys:
+        argp.error('--diff-against can not be used with -i')
+    reports_requested = (opts.report_dir is not None
+                         or opts.bug_bundle is not None)
+    if reports_requested and (opts.summary is not None
+                              or opts.forecast is not None
+                              or opts.fail_fast or opts.quiet
+                              or opts.format != 'text'):
+        argp.error('--report-dir and --bug-bundle can not be used with '
+                   '--summary, --forecast, --fail-fast, --quiet or --format')
+    if opts.output is not None and (opts.summary is not None
+                                    or opts.forecast is not None
+                                    or opts.fail_fast or opts.quiet
+                                    or opts.format != 'text'
+                                    or reports_requested):
+        argp.error('--output can not be used with --summary, --forecast, '
+                   '--fail-fast, --quiet, --format, --report-dir '
+                   'or --bug-bundle')
+    if opts.bug_bundle is not None:
+        from glep63.report import bug_bundle_exists
+        if bug_bundle_exists(opts.bug_bundle,
+                             opts.bug_bundle_format == 'maildir'):
+            argp.error('--bug-bundle mailbox {} is not empty, refusing '
+                       'to add duplicate bugs'.format(opts.bug_bundle))
+    sinks = [(sink, sink_options(opts, sink)) for sink in opts.output or ()]
+    if opts.diff_against is not None and any(
+            sopts.ignore_extraneous_keys for sink, sopts in sinks):
+        argp.error('--diff-against can not be used with -i')
+
+    limits = KeyLimits(*(getattr(opts, 'max_' + name) or None
+                         for name in KeyLimits._fields))
+
+    if opts.all_specs:
+        spec_names = list(SPECS)
+    else:
+        spec_names = opts.spec or [DEFAULT_SPEC]
+    try:
+        specs = [select_rules(SPECS[name], opts.only, opts.skip)
+                 for name in spec_names]
+    except ValueError as e:
+        argp.error(str(e))
+    # do not evaluate rules producing only warnings if they are not used;
+    # with -i, warnings are needed to tell whether the developer has
+    # a good key
+    if sinks:
+        warnings_used = any(not sopts.errors_only
+                            or sopts.ignore_extraneous_keys
+                            for sink, sopts in sinks)
+    else:
+        warnings_used = (opts.ignore_extraneous_keys
+                         or not opts.errors_only and (
+                             not opts.quiet or opts.warnings_as_errors))
+    if not warnings_used:
+        specs = [drop_warnings(spec) for spec in specs]
+    context = EvaluationContext(opts.as_of)
+
+    diffs = None
+    if opts.diff_against is not None:
+        try:
+            with open(opts.diff_against, encoding='UTF-8') as f:
+                old = Snapshot.load(f)
+        except (OSError, ValueError, KeyError) as e:
+            argp.error('Unable to load snapshot {}: {}'
+                       .format(opts.diff_against, e))
+        diffs = [SnapshotDiff(old.issues(name)) for name in spec_names]
+    snapshot = None
+    if opts.save_snapshot is not None:
+        snapshot = Snapshot()
+
+    if opts.fail_fast:
+        keys = load_keys(opts, limits)
+        try:
+            found = find_first_failure(keys, specs, context, opts)
+        finally:
+            # stop reading keys (and terminate gpg)
+            keys.close()
+        if found is None:
+            return 0
+        j, i = found
+        if not opts.quiet:
+            out = make_output(sys.stdout, spec_names[j], len(specs), opts,
+                              header=True)
+            out.add(i.key, [i])
+            out.close()
+        return 1 if type(i) in FAIL else 2
+
+    if opts.summary is not None:
+        summaries = summarize_keys(load_keys(opts, limits), specs, context)
+        print_summary(spec_names, summaries, opts)
+        return summary_status(summaries, opts)
+
+    if opts.forecast is not None:
+        keys = list(load_keys(opts, limits))
+        for name, spec in zip(spec_names, specs):
+            print_spec_header(name, len(specs), opts)
+            prefix = spec_prefix(name, len(specs), opts)
+            print_forecast(keys, spec, context, opts.forecast, opts,
+                           prefix)
+        return 0
+
+    cache = None
+    if not opts.no_cache:
+        try:
+            cache = ResultCache(opts.cache_file or default_cache_path(),
+                                opts.cache_size)
+        except (OSError, sqlite3.Error) as e:
+            print('Unable to open result cache: {}'.format(e),
+                  file=sys.stderr)
+
+    with contextlib.ExitStack() as stack:
+        submit = submit_keys_specs
+        depth = 1
+        if opts.jobs is not None and opts.jobs > 1:
+            from glep63.parallel import ParallelChecker
+            submit = stack.enter_context(
+                ParallelChecker(opts.jobs, context, specs,
+                                CHUNK_SIZE)).submit
+            # give every worker a few chunks of its own
+            depth = opts.jobs * 4
+        if cache is not None:
+            stack.enter_context(cache)
+            submit = functools.partial(submit_keys_cached, cache=cache,
+                                       submit=submit)
+
+        # every target is a tuple of the file, options and outputs
+        # for every spec, all fed with the same results
+        targets = []
+        change = NEW if diffs is not None else None
+        reports = {}
+        if reports_requested:
+            from glep63.report import ReportOutput
+            # all specs share the reports, lines are prefixed with
+            # the spec name if there is more than one
+            targets.append((None, opts, [
+                ReportOutput(reports, opts,
+                             [name] if len(specs) > 1 else [])
+                for name in spec_names]))
+        elif sinks:
+            for sink, sopts in sinks:
+                if sink.path == '-':
+                    f = sys.stdout
+                else:
+                    f = stack.enter_context(open(sink.path, 'w',
+                                                 encoding='UTF-8'))
+                targets.append((f, sopts, open_outputs(
+                    f, spec_names, sopts, stack, change)))
+        elif not opts.quiet:
+            targets.append((sys.stdout, opts, open_outputs(
+                sys.stdout, spec_names, opts, stack, change)))
+
+        ret = 0
+        keys = load_keys(opts, limits)
+        try:
+            for chunk, results in check_chunks(keys, specs, context, submit,
+                                               CHUNK_SIZE, depth):
+                if snapshot is not None:
+                    for name, spec_results in zip(spec_names, results):
+                        for keyret in spec_results:
+                            snapshot.add(name, keyret)
+                if diffs is not None:
+                    results = [[diff.new(keyret) for keyret in spec_results]
+                               for diff, spec_results in zip(diffs, results)]
+                if not targets:
+                    ret |= results_status(results, opts)
+                    continue
+                for f, topts, outputs in targets:
+                    for out, spec_results in zip(outputs, results):
+                        for k, keyret in zip(chunk, spec_results):
+                            out.add(k, keyret)
+                sys.stdout.flush()
+        finally:
+            keys.close()
+
+        for f, topts, outputs in targets:
+            ret |= close_outputs(f, spec_names, outputs, topts, diffs)
+
+    if opts.report_dir is not None:
+        from glep63.report import write_reports
+        write_reports(opts.report_dir, reports, opts.jobs)
+    if opts.bug_bundle is not None:
+        from glep63.report import write_bug_bundle
+        write_bug_bundle(opts.bug_bundle, reports,
+                         opts.bug_bundle_format == 'maildir')
+    if snapshot is not None:
+        snapshot.save(opts.save_snapshot)
+    if cache is not None and cache.error is not None:
+        print('Result cache disabled: {}'.format(cache.error),
+              file=sys.stderr)
+    if cache is not None and opts.cache_stats:
+        print(cache.format_stats(), file=sys.stderr)
+
+    return ret
+
+
+def results_status(results, opts):
+    """
+    Return the exit status for @results (for all specs), without
+    formatting any messages.
+    """
+
+    ret = 0
+    warnings_fail = opts.warnings_as_errors and not opts.errors_only
+    for spec_results in results:
+        for keyret in spec_results:
+            for i in keyret:
+                if type(i) in FAIL:
+                    ret |= 1
+                elif warnings_fail:
+                    ret |= 2
+                if ret == (3 if warnings_fail else 1):
+                    return ret
+    return ret
+
+
+def check_chunks(keys, specs, context, submit, chunk_size, depth):
+    """
+    Check @keys against @specs in chunks of @chunk_size keys, starting
+    the checks via @submit (called like submit_keys_specs()).  Up to
+    @depth chunks are being checked at a time.  Yields tuples of chunk
+    and its results, in the input order, as soon as they are available.
+    """
+
+    pending = collections.deque()
+    reading = True
+    while True:
+        if reading and len(pending) < depth:
+            chunk = list(itertools.islice(keys, chunk_size))
+            if chunk:
+                pending.append((chunk, submit(chunk, specs, context)))
+            else:
+                reading = False
+        if not pending:
+            break
+        # keep reading keys while the oldest chunk is being checked
+        if reading and len(pending) < depth and not pending[0][1].ready():
+            continue
+        chunk, results = pending.popleft()
+        yield chunk, results.get()
+
+
+def load_keys(opts, limits):
+    """
+    Load keys from the source specified in @opts, applying per-key
+    @limits.  Yields keys as they are read.
+    """
 
     if opts.developers or opts.all_developers:
+        import shutil
+        import tempfile
+        import urllib.request
+
         keyring_url = ('https://qa-reports.gentoo.org/output/{}.gpg'
                        .format('committing-devs' if opts.developers
                                else 'active-devs'))
         with urllib.request.urlopen(keyring_url) as f:
             with tempfile.NamedTemporaryFile() as tmpf:
-                shutil.copyfileobj(f, tmpf)
+                if opts.verify_signature is not None:
+                    sig_url = opts.verify_signature or keyring_url + '.sig'
+                    with urllib.request.urlopen(sig_url) as sigf:
+                        with tempfile.NamedTemporaryFile() as sigtmpf:
+                            shutil.copyfileobj(sigf, sigtmpf)
+                            sigtmpf.flush()
+                            # keys are processed only once this succeeds
+                            copy_verified(f, tmpf, sigtmpf.name,
+                                          opts.verify_keyring,
+                                          opts.verify_signer)
+                else:
+                    shutil.copyfileobj(f, tmpf)
                 tmpf.flush()
-                keys.extend(process_gnupg_key([tmpf.name], opts.key_id))
+                yield from iter_gnupg_key([tmpf.name], opts.key_id, limits)
     elif opts.key_id is not None or opts.all or opts.keyring is not None:
-        keys.extend(process_gnupg_key(opts.keyring, opts.key_id))
+        yield from iter_gnupg_key(opts.keyring, opts.key_id, limits)
     elif opts.gnupg is not None:
         for f in opts.gnupg:
-            keys.extend(process_gnupg_colons(f))
+            yield from iter_gnupg_colons(f, limits)
 
-    out = []
-    for k in keys:
-        keyret = check_key(k, SPECS[opts.spec])
-        if not keyret and opts.ignore_extraneous_keys:
-            keyret = [GoodKey(k)]
-        out.extend(keyret)
+
+def sink_options(opts, sink):
+    """
+    Return the options for OutputSink @sink: a copy of @opts with
+    the format and filters of the sink applied.
+    """
+
+    ret = argparse.Namespace(**vars(opts))
+    ret.format = 'ndjson' if sink.format == 'ndjson' else 'text'
+    ret.summary = {'summary': 'table',
+                   'summary-json': 'json'}.get(sink.format)
+    if sink.format == 'machine':
+        ret.machine_readable = True
+    for x in sink.filters:
+        setattr(ret, x.replace('-', '_'), True)
+    return ret
+
+
+def make_output(f, name, spec_count, opts, change=None, header=False):
+    """
+    Create the Output for results against spec @name in the format
+    requested in @opts, writing to @f.  If @header is True, the spec
+    header is printed immediately.  @change specifies whether
+    the output is for new or resolved issues when comparing against
+    a snapshot.
+    """
+
+    if opts.format == 'ndjson':
+        return NDJSONOutput(f, opts, name if spec_count > 1 else None,
+                            change)
+    if header:
+        print_spec_header(name, spec_count, opts, f)
+    prefix = spec_prefix(name, spec_count, opts)
+    if change is not None:
+        prefix = prefix + [DIFF_MARKERS[change]]
+    return TextOutput(f, opts, prefix)
+
+
+def open_outputs(f, spec_names, opts, stack, change=None):
+    """
+    Create outputs for results against all @spec_names, as requested
+    in @opts, for writing to @f.  Results for the first spec are written
+    directly, for the other specs text output is spooled into temporary
+    files entered into ExitStack @stack, until close_outputs().
+    For summaries, SummaryCounters are returned instead.
+    """
+
+    if opts.summary is not None:
+        return [SummaryCounter() for name in spec_names]
+
+    outputs = []
+    for j, name in enumerate(spec_names):
+        if j == 0 or opts.format != 'text':
+            out_f = f
+        else:
+            import tempfile
+            out_f = stack.enter_context(tempfile.SpooledTemporaryFile(
+                SPOOL_MAX_SIZE, mode='w+', encoding='UTF-8'))
+        outputs.append(make_output(out_f, name, len(spec_names), opts,
+                                   change, header=out_f is f))
+    return outputs
+
+
+def close_outputs(f, spec_names, outputs, opts, diffs=None):
+    """
+    Finish @outputs created by open_outputs() (or ReportOutputs, if @f
+    is None): print the summaries or the resolved issues for SnapshotDiffs
+    @diffs, and copy the spooled output into @f.  Returns the exit status.
+    """
+
+    if opts.summary is not None:
+        summaries = [counter.summary() for counter in outputs]
+        print_summary(spec_names, summaries, opts, f)
+        return summary_status(summaries, opts)
 
     ret = 0
-    good_devs = set()
-    msgs = []
-    for i in out:
-        # figure out a primary UID, preferring @gentoo.org
-        primary_uid = i.key.uids[0].user_id
-        for x in i.key.uids:
-            if '@gentoo.org' in x.user_id:
-                primary_uid = x.user_id
-                break
-        _, uid_addr = email.utils.parseaddr(primary_uid)
-
-        if isinstance(i, GoodKey):
-            good_devs.add(uid_addr)
+    for j, (name, out) in enumerate(zip(spec_names, outputs)):
+        ret |= out.close()
+        if f is None:
             continue
+        if diffs is not None:
+            # resolved issues follow the new ones
+            print_resolved(out.f, name, len(spec_names), diffs[j], opts)
+        if out.f is not f:
+            import shutil
+            print_spec_header(name, len(spec_names), opts, f)
+            out.f.seek(0)
+            shutil.copyfileobj(out.f, f)
+    return ret
 
-        keyid = i.key.keyid
-        if hasattr(i, 'subkey'):
-            keyid += ':' + i.subkey.keyid
-        elif hasattr(i, 'uid'):
-            if opts.no_name:
-                _, uid_fmt = email.utils.parseaddr(i.uid_user_id)
-            else:
-                uid_fmt = i.uid.user_id
-            keyid += ':[{}]'.format(uid_fmt)
 
-        if type(i) in FAIL:
-            ret |= 1
-            cls = '[E]'
-        else:
-            assert type(i) in WARN
-            cls = '[W]'
-            if opts.errors_only:
-                continue
-            if opts.warnings_as_errors:
-                ret |= 2
+def print_resolved(f, name, spec_count, diff, opts):
+    """
+    Write the issues against spec @name resolved since the snapshot
+    compared against in SnapshotDiff @diff into @f.
+    """
 
-        if opts.machine_readable:
-            msg = [keyid, i.machine_desc]
-        else:
-            msg = [keyid, '[{}]'.format(
-                uid_addr if opts.no_name else primary_uid),
-                cls, i.machine_desc, i.long_desc]
+    out = make_output(f, name, spec_count, opts, RESOLVED)
+    for _, keyret in itertools.groupby(diff.resolved(),
+                                       key=lambda i: id(i.key)):
+        keyret = list(keyret)
+        out.add(keyret[0].key, keyret)
+    out.close()
+
+
+def spec_prefix(name, spec_count, opts):
+    """
+    Return the prefix for output lines for spec @name.  If more than
+    one spec is being checked, the machine-readable lines are prefixed
+    with the spec name.
+    """
 
-        msgs.append((uid_addr, msg))
+    if spec_count > 1 and opts.machine_readable:
+        return [name]
+    return []
 
-    for addr, msg in msgs:
-        if addr not in good_devs:
-            print(' '.join(msg))
 
+def print_spec_header(name, spec_count, opts, f=None):
+    """
+    Print the header preceding human-readable output for spec @name
+    into @f (stdout by default), if more than one spec is being checked.
+    """
+
+    if spec_count > 1 and not opts.machine_readable:
+        print('== {}: {} =='.format(name, SPECS[name]['__doc__']), file=f)
+
+
+def find_first_failure(keys, specs, context, opts):
+    """
+    Check @keys against @specs until the first issue affecting the exit
+    status (an error, or a warning with -w) is found.  Returns a tuple
+    of spec index and the issue, or None if there are no such issues.
+    """
+
+    warnings_fail = opts.warnings_as_errors and not opts.errors_only
+    for k in keys:
+        for j, keyret in enumerate(check_key_specs(k, specs, context)):
+            for i in keyret:
+                if type(i) in FAIL or warnings_fail:
+                    return j, i
+    return None
+
+
+def print_forecast(keys, spec, context, days, opts, prefix=[]):
+    """
+    Print the forecast of changes in check results of @keys against
+    @spec over the next @days days.
+    """
+
+    from glep63.forecast import forecast_key
+
+    end = context.now + datetime.timedelta(days=days)
+    for k in keys:
+        for ev in forecast_key(k, spec, context.now, end):
+            time = ev.time.strftime('%Y-%m-%d %H:%M:%S')
+            for sign, issues in (('+', ev.added), ('-', ev.removed)):
+                for i in issues:
+                    if opts.errors_only and type(i) not in FAIL:
+                        continue
+                    _, msg = format_issue(i, opts)
+                    print(' '.join(prefix + [time, sign] + msg))
+
+
+def summary_status(summaries, opts):
+    """
+    Return the exit status for @summaries.
+    """
+
+    ret = 0
+    for s in summaries:
+        for severity, machine_desc in s.issues:
+            if severity == ERROR:
+                ret |= 1
+            elif opts.warnings_as_errors and not opts.errors_only:
+                ret |= 2
     return ret
+
+
+def print_summary(spec_names, summaries, opts, f=None):
+    """
+    Print @summaries for specs @spec_names into @f (stdout by default),
+    either as a table or as JSON.
+    """
+
+    if f is None:
+        f = sys.stdout
+
+    def issue_counts(s, severity):
+        return sorted(((machine_desc, count) for (sev, machine_desc), count
+                       in s.issues.items() if sev == severity),
+                      key=lambda x: (-x[1], x[0]))
+
+    severities = [ERROR]
+    if not opts.errors_only:
+        severities.append(WARNING)
+
+    if opts.summary == 'json':
+        data = {}
+        for name, s in zip(spec_names, summaries):
+            data[name] = {
+                'keys': s.keys,
+                'error_keys': s.error_keys,
+                'issues': dict((severity, dict(issue_counts(s, severity)))
+                               for severity in severities),
+            }
+            if not opts.errors_only:
+                data[name]['warning_keys'] = s.warning_keys
+        json.dump(data, f, indent=2, sort_keys=True)
+        print(file=f)
+        return
+
+    for name, s in zip(spec_names, summaries):
+        print_spec_header(name, len(summaries), opts, f)
+        prefix = spec_prefix(name, len(summaries), opts)
+        for severity in severities:
+            for machine_desc, count in issue_counts(s, severity):
+                print(' '.join(prefix + ['{:>8}'.format(count),
+                                         '{:<7}'.format(severity),
+                                         machine_desc]), file=f)
+        totals = '{:>8} keys checked, {} with errors'.format(s.keys,
+                                                             s.error_keys)
+        if not opts.errors_only:
+            totals += ', {} with warnings only'.format(s.warning_keys)
+        print(' '.join(prefix + [totals]), file=f)
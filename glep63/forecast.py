@@ -0,0 +1,73 @@
+# glep63-check -- forecasting changes in check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import collections
+import datetime
+
+from glep63.base import (Validity,)
+from glep63.check import (EvaluationContext, check_key, verdict_instants)
+from glep63.serialize import (issue_id,)
+from glep63.specs import (compile_spec,)
+
+
+# change of check results at @time: lists of issues that appear
+# and that are resolved
+TimelineEvent = collections.namedtuple('TimelineEvent',
+    ('time', 'added', 'removed'))
+
+UNCHANGED_VALIDITY = (Validity.INVALID, Validity.REVOKED, Validity.EXPIRED)
+
+
+def key_as_of(k, t):
+    """
+    Return key @k with primary key and subkeys that will be expired
+    at datetime @t marked as such, the way GnuPG would do.
+    """
+
+    def expire(sk):
+        if (sk.expiration_date is not None and sk.expiration_date <= t
+                and sk.validity not in UNCHANGED_VALIDITY):
+            return sk._replace(validity=Validity.EXPIRED)
+        return sk
+
+    new_subkeys = [expire(sk) for sk in k.subkeys]
+    if all(a is b for a, b in zip(new_subkeys, k.subkeys)):
+        new_subkeys = k.subkeys
+    return expire(k)._replace(subkeys=new_subkeys)
+
+
+def forecast_key(k, spec, start, end):
+    """
+    Forecast how the result of checking key @k against @spec changes
+    between datetimes @start and @end.  Returns a list of TimelineEvents.
+
+    Rather than checking the key repeatedly over the whole period,
+    the key is checked only right after the instants at which any
+    expiration rule flips its verdict or at which a key expires.
+    """
+
+    spec = compile_spec(spec)
+    instants = set(verdict_instants(k, spec))
+    for sk in [k] + list(k.subkeys):
+        if sk.expiration_date is not None:
+            # GnuPG considers key expired at expiration date
+            instants.add(sk.expiration_date
+                         - datetime.timedelta(microseconds=1))
+
+    prev = check_key(key_as_of(k, start), spec, EvaluationContext(start))
+    prev_ids = dict((issue_id(i), i) for i in prev)
+    out = []
+    for t in sorted(instants):
+        if t < start or t >= end:
+            continue
+        # the verdict changes right after the instant
+        t += datetime.timedelta(microseconds=1)
+        cur = check_key(key_as_of(k, t), spec, EvaluationContext(t))
+        cur_ids = dict((issue_id(i), i) for i in cur)
+        added = [i for x, i in cur_ids.items() if x not in prev_ids]
+        removed = [i for x, i in prev_ids.items() if x not in cur_ids]
+        if added or removed:
+            out.append(TimelineEvent(t, added, removed))
+        prev_ids = cur_ids
+    return out
@@ -2,6 +2,7 @@
 # (c) 2018 Michał Górny
 # Released under the terms of 2-clause BSD license.
 
+import collections
 import datetime
 import io
 import subprocess
@@ -9,6 +10,15 @@ import subprocess
 from glep63.base import (Key, PublicKey, UID, KeyAlgo, Validity)
 
 
+# per-key limits on the amount of data processed, None means unlimited
+KeyLimits = collections.namedtuple('KeyLimits',
+    ('uids', 'subkeys', 'records', 'bytes'))
+
+NO_LIMITS = KeyLimits(None, None, None, None)
+DEFAULT_LIMITS = KeyLimits(uids=1000, subkeys=1000, records=10000,
+                           bytes=4 * 1024 * 1024)
+
+
 def process_date(d):
     if d == '':
         return None
@@ -30,34 +40,158 @@ def process_initial_key_fields(validity, key_length, key_algo, keyid,
     )
 
 
-def process_gnupg_colons(f):
+def exceeded_limit(counts, limits):
     """
-    Process "gpg --with-colons" output from stream @f, and into list
-    of key objects.
+    Return the name of the first limit in KeyLimits @limits exceeded
+    by @counts, or None.
     """
 
-    keys = []
+    for name, limit in zip(limits._fields, limits):
+        if limit is not None and counts[name] > limit:
+            return name
+    return None
+
+
+def iter_gnupg_colons(f, limits=DEFAULT_LIMITS):
+    """
+    Process "gpg --with-colons" output from stream @f, yielding key
+    objects as soon as all their records are read.
+
+    @limits specifies KeyLimits for every key.  When a key exceeds
+    them (e.g. due to certificate flooding), its remaining records
+    are skipped and the overflow field is set to the name of the limit.
+    """
+
+    key = None
+    prev_type = None
+    counts = collections.Counter()
+    skip = False
 
     for l in f:
+        if l.startswith('pub:'):
+            if key is not None:
+                yield key
+            counts.clear()
+            skip = False
+        elif skip:
+            continue
+        elif key is not None:
+            counts['records'] += 1
+            counts['bytes'] += len(l.encode('UTF-8'))
+            if l.startswith('sub:'):
+                counts['subkeys'] += 1
+            elif l.startswith('uid:'):
+                counts['uids'] += 1
+            overflow = exceeded_limit(counts, limits)
+            if overflow is not None:
+                key = key._replace(overflow=overflow)
+                skip = True
+                continue
+
         vals = l.split(':')
 
         # type of record
         if vals[0] == 'pub':
-            keys.append(PublicKey(
+            key = PublicKey(
                 *process_initial_key_fields(*vals[1:7]) +
-                (vals[11], vals[16] if vals[16:17] else '', [], [])))
+                (vals[11], vals[16] if vals[16:17] else '', [], []))
+        elif vals[0] == 'fpr':
+            # fingerprint of the primary key immediately follows it
+            if prev_type == 'pub':
+                key = key._replace(fingerprint=vals[9])
         elif vals[0] == 'sub':
-            assert keys
-            keys[-1].subkeys.append(Key(
+            assert key is not None
+            key.subkeys.append(Key(
                 *(process_initial_key_fields(*vals[1:7]) +
                 (vals[11], vals[16] if vals[16:17] else ''))))
         elif vals[0] == 'uid':
-            assert keys
-            keys[-1].uids.append(UID(Validity(vals[1]),
+            assert key is not None
+            key.uids.append(UID(Validity(vals[1]),
                 process_date(vals[5]), process_date(vals[6]),
                 vals[7], vals[9]))
+        prev_type = vals[0]
+
+    if key is not None:
+        yield key
+
 
-    return keys
+def process_gnupg_colons(f, limits=DEFAULT_LIMITS):
+    """
+    Process "gpg --with-colons" output from stream @f, and into list
+    of key objects.  @limits are passed to iter_gnupg_colons().
+    """
+
+    return list(iter_gnupg_colons(f, limits))
+
+
+class SignatureError(Exception):
+    """
+    Signature that is valid but was not made by any of the expected
+    signers.
+    """
+
+    pass
+
+
+def copy_verified(f, out_f, sig_path, keyrings=None, signers=None,
+                  bufsize=65536):
+    """
+    Copy data from binary stream @f into @out_f, verifying it against
+    the detached signature in @sig_path at the same time.  The data is
+    piped into "gpg --verify" while it is being copied, so it is hashed
+    as it streams rather than being read again afterwards.
+
+    @keyrings specifies a list of alternate keyrings holding the signing
+    key.  If None, the default keyring is used.
+
+    @signers specifies a list of fingerprints of keys that are accepted
+    as signers (either the signing subkey or its primary key).  If None,
+    a valid signature made by any key in the keyrings is accepted.
+
+    Raises subprocess.CalledProcessError if the signature is not valid,
+    and SignatureError if it was not made by any of @signers.
+    """
+
+    args = ['--status-fd', '1']
+    if keyrings is not None:
+        args += ['--no-default-keyring']
+        for k in keyrings:
+            args += ['--keyring', k]
+    args += ['--verify', sig_path, '-']
+
+    with spawn_gnupg(args, stdin=subprocess.PIPE,
+                     stdout=subprocess.PIPE) as s:
+        try:
+            while True:
+                buf = f.read(bufsize)
+                if not buf:
+                    break
+                out_f.write(buf)
+                s.stdin.write(buf)
+            s.stdin.close()
+        except BrokenPipeError:
+            # gpg gave up early, its exit status tells why
+            pass
+        # status output is small, so it is read once all data is written
+        status = s.stdout.read().decode('UTF-8', 'replace')
+        if s.wait() != 0:
+            raise subprocess.CalledProcessError(s.returncode,
+                    [GNUPG_EXECUTABLE] + args)
+
+    if signers is not None:
+        signers = set(x.replace(' ', '').upper() for x in signers)
+        found = []
+        for l in status.splitlines():
+            vals = l.split()
+            if vals[:2] == ['[GNUPG:]', 'VALIDSIG']:
+                # signing key and primary key fingerprints
+                fprs = [vals[2], vals[11] if len(vals) > 11 else vals[2]]
+                if signers.intersection(fprs):
+                    return
+                found.append(fprs[-1])
+        raise SignatureError('signature not made by an expected signer '
+                             '(made by: {})'.format(', '.join(found)
+                                                    or 'none'))
 
 
 GNUPG_EXECUTABLE = None
@@ -96,15 +230,18 @@ def spawn_gnupg(args, **subprocess_kwargs):
                                 **subprocess_kwargs)
 
 
-def process_gnupg_key(keyrings=None, keyids=None):
+def iter_gnupg_key(keyrings=None, keyids=None, limits=DEFAULT_LIMITS):
     """
-    Call gpg to get key information.
+    Call gpg to get key information, yielding key objects as they
+    are read.  If the generator is closed early, gpg is terminated.
 
     @keyrings specifies a list of alternate keyrings to use.  If None,
     the default keyring is used.
 
     @keyids specifies a list of keys to process.  If None, all keys
     in the keyring(s) are processed.
+
+    @limits specifies per-key KeyLimits, as in iter_gnupg_colons().
     """
 
     args = ['--with-colons', '--list-keys', '--fixed-list-mode']
@@ -118,10 +255,21 @@ def process_gnupg_key(keyrings=None, keyids=None):
     with spawn_gnupg(args,
                      stdin=subprocess.PIPE,
                      stdout=subprocess.PIPE) as s:
-        with io.TextIOWrapper(s.stdout, encoding='UTF-8') as sout:
-            keys = process_gnupg_colons(sout)
-            if s.wait() != 0:
-                raise subprocess.CalledProcessError(s.returncode,
-                        [GNUPG_EXECUTABLE] + args)
+        try:
+            with io.TextIOWrapper(s.stdout, encoding='UTF-8') as sout:
+                yield from iter_gnupg_colons(sout, limits)
+        except GeneratorExit:
+            s.terminate()
+            raise
+        if s.wait() != 0:
+            raise subprocess.CalledProcessError(s.returncode,
+                    [GNUPG_EXECUTABLE] + args)
+
+
+def process_gnupg_key(keyrings=None, keyids=None, limits=DEFAULT_LIMITS):
+    """
+    Call gpg to get key information.  Returns a list of key objects.
+    The parameters are the same as for iter_gnupg_key().
+    """
 
-    return keys
+    return list(iter_gnupg_key(keyrings, keyids, limits))
@@ -0,0 +1,47 @@
+# glep63-check -- optional dependencies imported on first use
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import importlib
+
+# optional modules are imported on first use, as importing them takes
+# longer than checking a few keys; they are UNLOADED until then,
+# and None if not available
+UNLOADED = object()
+numpy = UNLOADED
+orjson = UNLOADED
+
+
+def load_optional(name):
+    """
+    Import optional module @name if it was not imported yet, and store
+    it in the global variable of the same name.  Returns the module,
+    or None if it is not available.
+    """
+
+    mod = globals()[name]
+    if mod is UNLOADED:
+        try:
+            mod = importlib.import_module(name)
+        except ImportError:
+            mod = None
+        globals()[name] = mod
+    return mod
+
+
+def load_numpy():
+    """
+    Import NumPy if it was not imported yet.  Returns the module,
+    or None if it is not available.
+    """
+
+    return load_optional('numpy')
+
+
+def load_orjson():
+    """
+    Import orjson if it was not imported yet.  Returns the module,
+    or None if it is not available.
+    """
+
+    return load_optional('orjson')
@@ -0,0 +1,254 @@
+# glep63-check -- output of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import collections
+import itertools
+import json
+
+from glep63.base import (KeyIssue, KeyWarning, SubKeyIssue, SubKeyWarning,
+        UIDIssue)
+from glep63.check import (uid_email,)
+from glep63.optional import (load_orjson,)
+
+
+def primary_uid(key):
+    """
+    Return a tuple of primary UID and its e-mail address for @key,
+    preferring @gentoo.org.  If the key has no UIDs (e.g. because
+    it exceeded the limits before the first one), the keyid is used
+    for both.
+    """
+
+    if not key.uids:
+        return key.keyid, key.keyid
+    primary_uid = key.uids[0].user_id
+    for x in key.uids:
+        if '@gentoo.org' in x.user_id:
+            primary_uid = x.user_id
+            break
+    return primary_uid, uid_email(primary_uid)
+
+
+# output-related data of the key, computed once for all its issues:
+# keyid, primary UID, its e-mail address and the UID field for output
+KeyContext = collections.namedtuple('KeyContext',
+    ('keyid', 'uid', 'addr', 'uid_field'))
+
+
+def key_context(k, opts):
+    """
+    Return KeyContext for key @k.
+    """
+
+    uid, addr = primary_uid(k)
+    return KeyContext(k.keyid, uid, addr,
+                      '[{}]'.format(addr if opts.no_name else uid))
+
+
+def key_ref(i, ctx, opts):
+    return ctx.keyid
+
+
+def subkey_ref(i, ctx, opts):
+    return ctx.keyid + ':' + i.subkey.keyid
+
+
+def uid_ref(i, ctx, opts):
+    if opts.no_name:
+        uid_fmt = uid_email(i.uid.user_id)
+    else:
+        uid_fmt = i.uid.user_id
+    return '{}:[{}]'.format(ctx.keyid, uid_fmt)
+
+
+# properties of issue types: whether it is an error, the object it
+# refers to, and function returning the keyid field for output
+IssueType = collections.namedtuple('IssueType', ('error', 'kind', 'ref'))
+
+ISSUE_TYPES = {
+    KeyIssue: IssueType(True, 'key', key_ref),
+    KeyWarning: IssueType(False, 'key', key_ref),
+    SubKeyIssue: IssueType(True, 'subkey', subkey_ref),
+    SubKeyWarning: IssueType(False, 'subkey', subkey_ref),
+    UIDIssue: IssueType(True, 'uid', uid_ref),
+}
+
+
+def format_issue(i, opts, ctx=None):
+    """
+    Format issue @i for output.  @ctx can provide the KeyContext
+    for the key.  Returns a tuple of e-mail address of the developer
+    and a list of message fields.
+    """
+
+    if ctx is None:
+        ctx = key_context(i.key, opts)
+    issue_type = ISSUE_TYPES[type(i)]
+
+    keyid = issue_type.ref(i, ctx, opts)
+    if opts.machine_readable:
+        msg = [keyid, i.machine_desc]
+    else:
+        msg = [keyid, ctx.uid_field, '[E]' if issue_type.error else '[W]',
+               i.machine_desc, str(i.long_desc)]
+
+    return ctx.addr, msg
+
+
+def json_dumps(obj):
+    """
+    Encode @obj as compact JSON, using orjson if available.
+    """
+
+    orjson = load_orjson()
+    if orjson is not None:
+        return orjson.dumps(obj).decode('UTF-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+class Output(object):
+    """
+    Base class for output of check results against a single spec.
+    Results are written to text stream @f as soon as they are final,
+    one line per issue.  Subclasses implement format_issue().
+
+    With opts.ignore_extraneous_keys, messages are held back until
+    it is known whether the developer has a good key.  If
+    opts.grouped_input is set, keys of every developer are assumed
+    to be adjacent, and the messages are written once the next
+    developer's key is seen.  Otherwise, they are written on close(),
+    though messages of developers found to have a good key are
+    discarded immediately.
+    """
+
+    def __init__(self, f, opts):
+        self.f = f
+        self.opts = opts
+        self.ret = 0
+        self.good_devs = set()
+        # held lines: {address: [(sequence number, key, line), ...]}
+        self.pending = {}
+        self.seq = itertools.count()
+        self.current_dev = None
+
+    def add(self, k, keyret):
+        """
+        Add check results @keyret for key @k.
+        """
+
+        if not keyret and not self.opts.ignore_extraneous_keys:
+            return
+        # the output data of the key is determined once, not per issue
+        ctx = key_context(k, self.opts)
+        addr = ctx.addr
+
+        if self.opts.ignore_extraneous_keys:
+            if self.opts.grouped_input and addr != self.current_dev:
+                self.flush()
+                self.current_dev = addr
+            if not keyret:
+                self.good_devs.add(addr)
+                self.pending.pop(addr, None)
+
+        for i in keyret:
+            issue_type = ISSUE_TYPES[type(i)]
+            if issue_type.error:
+                self.ret |= 1
+            else:
+                if self.opts.errors_only:
+                    continue
+                if self.opts.warnings_as_errors:
+                    self.ret |= 2
+
+            line = self.format_issue(i, issue_type, ctx)
+            if not self.opts.ignore_extraneous_keys:
+                self.write(k, addr, line)
+            elif addr not in self.good_devs:
+                self.pending.setdefault(addr, []).append(
+                    (next(self.seq), k, line))
+
+    def format_issue(self, i, issue_type, ctx):
+        """
+        Return the output line (including the newline) for issue @i.
+        @issue_type is its IssueType, and @ctx the KeyContext
+        for the key.
+        """
+
+        raise NotImplementedError()
+
+    def write(self, k, addr, line):
+        """
+        Write the output @line for an issue of key @k belonging
+        to developer @addr.
+        """
+
+        self.f.write(line)
+
+    def flush(self):
+        """
+        Write all held messages.
+        """
+
+        # sequence numbers are unique, so keys are never compared
+        for seq, addr, k, line in sorted(
+                (seq, addr, k, line) for addr, lines in self.pending.items()
+                for seq, k, line in lines):
+            self.write(k, addr, line)
+        self.pending.clear()
+
+    def close(self):
+        """
+        Write remaining messages, and return the exit status.
+        """
+
+        self.flush()
+        return self.ret
+
+
+class TextOutput(Output):
+    """
+    Human-readable (or with opts.machine_readable, two-field) text
+    output, every line prefixed with @prefix.
+    """
+
+    def __init__(self, f, opts, prefix=[]):
+        super(TextOutput, self).__init__(f, opts)
+        self.prefix = prefix
+
+    def format_issue(self, i, issue_type, ctx):
+        uid_addr, msg = format_issue(i, self.opts, ctx)
+        return ' '.join(self.prefix + msg) + '\n'
+
+
+class NDJSONOutput(Output):
+    """
+    Output of one JSON object per issue (newline-delimited JSON).
+    The long description is included unless opts.machine_readable
+    is set, the spec name if @spec is not None, and @change (whether
+    the issue is new or resolved, when comparing against a snapshot)
+    if it is not None.
+    """
+
+    def __init__(self, f, opts, spec=None, change=None):
+        super(NDJSONOutput, self).__init__(f, opts)
+        self.spec = spec
+        self.change = change
+
+    def format_issue(self, i, issue_type, ctx):
+        data = {
+            'fingerprint': i.key.fingerprint,
+            'keyid': ctx.keyid,
+            'subkey': i.subkey.keyid if issue_type.kind == 'subkey' else None,
+            'uid': i.uid.user_id if issue_type.kind == 'uid' else None,
+            'developer': ctx.addr,
+            'severity': 'error' if issue_type.error else 'warning',
+            'machine_desc': i.machine_desc,
+        }
+        if not self.opts.machine_readable:
+            data['long_desc'] = str(i.long_desc)
+        if self.spec is not None:
+            data['spec'] = self.spec
+        if self.change is not None:
+            data['change'] = self.change
+        return json_dumps(data) + '\n'
@@ -0,0 +1,133 @@
+# glep63-check -- parallel checking in worker processes
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import multiprocessing
+
+from glep63.batch import (CHUNK_SIZE, check_keys_specs)
+from glep63.check import (EvaluationContext,)
+from glep63.serialize import (encode_key, decode_key, encode_issues,
+                              decode_issues)
+
+
+# state of the worker process, set by init_worker()
+worker_context = None
+worker_specs = None
+
+
+def init_worker(now, specs):
+    global worker_context, worker_specs
+    worker_context = EvaluationContext(now)
+    worker_specs = specs
+
+
+def check_chunk(task):
+    """
+    Check a chunk of keys encoded via encode_key() against compiled
+    specs in the worker.  @task is a tuple of indexes into the specs
+    passed to init_worker(), and the chunk.  Returns encoded results
+    for every key, for every spec.
+    """
+
+    spec_indexes, chunk = task
+    specs = [worker_specs[i] for i in spec_indexes]
+    keys = [decode_key(data) for data in chunk]
+    results = check_keys_specs(keys, specs, worker_context)
+    return [[encode_issues(k, spec_results[i]) for spec_results in results]
+            for i, k in enumerate(keys)]
+
+
+class PendingKeys(object):
+    """
+    Results of checking @keys against @spec_count specs in the workers,
+    as a list of AsyncResults for every chunk.
+    """
+
+    def __init__(self, keys, spec_count, chunks):
+        self.keys = keys
+        self.spec_count = spec_count
+        self.chunks = chunks
+
+    def ready(self):
+        """
+        Return True if the results are available.
+        """
+
+        return all(r.ready() for r in self.chunks)
+
+    def get(self):
+        """
+        Wait for the results, and return them in the same form
+        as check_keys_specs().
+        """
+
+        results = [[] for i in range(self.spec_count)]
+        key_iter = iter(self.keys)
+        for r in self.chunks:
+            for key_results in r.get():
+                k = next(key_iter)
+                for spec_results, data in zip(results, key_results):
+                    spec_results.append(decode_issues(k, data))
+        return results
+
+
+class ParallelChecker(object):
+    """
+    Checker using a pool of @jobs worker processes that is kept
+    between calls.  It can be called like check_keys_specs(), though
+    the EvaluationContext passed must match @context, and the specs
+    must be a subset of compiled @specs.  The specs are passed
+    to the workers once, when they are started.  Checks can also
+    be started via submit(), without waiting for their results.
+    """
+
+    def __init__(self, jobs, context, specs, chunk_size=CHUNK_SIZE):
+        self.now = context.now
+        self.spec_indexes = dict((spec.fingerprint, i)
+                                 for i, spec in enumerate(specs))
+        self.chunk_size = chunk_size
+        self.pool = multiprocessing.Pool(jobs, initializer=init_worker,
+                                         initargs=(context.now, list(specs)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, keys, specs, context):
+        """
+        Start checking @keys against compiled @specs in the workers.
+        Returns PendingKeys providing the results.
+        """
+
+        assert context.now == self.now
+        spec_indexes = [self.spec_indexes[spec.fingerprint]
+                        for spec in specs]
+
+        chunk_size = self.chunk_size
+        tasks = [(spec_indexes,
+                  [encode_key(k) for k in keys[i:i+chunk_size]])
+                 for i in range(0, len(keys), chunk_size)]
+        return PendingKeys(keys, len(specs),
+                           [self.pool.apply_async(check_chunk, (task,))
+                            for task in tasks])
+
+    def __call__(self, keys, specs, context):
+        return self.submit(keys, specs, context).get()
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+
+def check_keys_parallel(keys, specs, context, jobs,
+                        chunk_size=CHUNK_SIZE):
+    """
+    Check @keys against all compiled @specs using @jobs worker
+    processes.  Returns results in the same form and order
+    as check_keys_specs().
+    """
+
+    with ParallelChecker(jobs, context, specs, chunk_size) as checker:
+        return checker(keys, specs, context)
@@ -0,0 +1,229 @@
+# glep63-check -- per-developer report files and bug bundles
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import collections
+import concurrent.futures
+import email.message
+import mailbox
+import os
+import os.path
+import urllib.parse
+
+from glep63.base import (KeyAlgo, Validity)
+from glep63.output import (TextOutput,)
+
+
+# labels of UID validity, as used by "gpg --list-keys"
+UID_VALIDITY = {
+    Validity.ULTIMATELY_VALID: 'ultimate',
+    Validity.FULLY_VALID: 'full',
+    Validity.MARGINALLY_VALID: 'marginal',
+    Validity.NOT_VALID: 'never',
+    Validity.UNDEFINED: 'undef',
+    Validity.REVOKED: 'revoked',
+    Validity.EXPIRED: 'expired',
+}
+
+# bug template for reporting issues to developers
+BUG_URL = 'https://bugs.gentoo.org/enter_bug.cgi'
+BUG_FIELDS = {
+    'product': 'Gentoo Infrastructure',
+    'component': 'Developer account issues',
+    'blocked': '659842',
+}
+BUG_SUMMARY = '{}: OpenPGP key does not conform to GLEP 63'
+BUG_COMMENT = '''Your key does not seem to conform to GLEP 63 [1]. glep63-check [2] indicates:
+
+{}
+Please see the tracker bug for tips on fixing your key.
+
+[1]:https://www.gentoo.org/glep/glep-0063.html
+[2]:https://github.com/mgorny/glep63-check
+'''
+BUG_SENDER = 'glep63-check <nobody@gentoo.org>'
+
+ALGO_NAMES = {
+    KeyAlgo.RSA: 'rsa',
+    KeyAlgo.RSA_ENCRYPT_ONLY: 'rsa',
+    KeyAlgo.RSA_SIGN_ONLY: 'rsa',
+    KeyAlgo.ELGAMAL: 'elg',
+    KeyAlgo.DSA: 'dsa',
+}
+
+
+def format_key_line(record_type, k):
+    """
+    Format the line describing (sub)key @k, in the style
+    of "gpg --list-keys".
+    """
+
+    if k.key_algo in ALGO_NAMES:
+        algo = '{}{}'.format(ALGO_NAMES[k.key_algo], k.key_length)
+    else:
+        algo = k.curve or k.key_algo.name.lower()
+    ret = '{:<5} {} {} [{}]'.format(
+        record_type, algo, k.creation_date.strftime('%Y-%m-%d'),
+        ''.join(c for c in k.key_caps if c.islower()).upper())
+    if k.validity == Validity.REVOKED:
+        ret += ' [revoked]'
+    elif k.expiration_date is not None:
+        ret += ' [{}: {}]'.format(
+            'expired' if k.validity == Validity.EXPIRED else 'expires',
+            k.expiration_date.strftime('%Y-%m-%d'))
+    return ret
+
+
+def format_key_summary(k):
+    """
+    Return the summary of key @k, in the style of "gpg --list-keys".
+    """
+
+    lines = [format_key_line('pub', k)]
+    if k.fingerprint is not None:
+        lines.append('      ' + k.fingerprint)
+    for u in k.uids:
+        lines.append('uid           [{:>8}] {}'.format(
+            UID_VALIDITY.get(u.validity, 'unknown'), u.user_id))
+    for sk in k.subkeys:
+        lines.append(format_key_line('sub', sk))
+    return '\n'.join(lines) + '\n'
+
+
+def report_filename(addr):
+    """
+    Return the name of the report file for developer @addr.
+    """
+
+    return (addr or 'unknown').replace(os.sep, '_') + '.txt'
+
+
+# issue lines and keys (by id) of a single developer
+DeveloperReport = collections.namedtuple('DeveloperReport',
+    ('lines', 'keys'))
+
+
+class ReportOutput(TextOutput):
+    """
+    Text output collecting lines per developer in @reports
+    (a dict of DeveloperReports), for writing them via write_reports().
+    """
+
+    def __init__(self, reports, opts, prefix=[]):
+        super(ReportOutput, self).__init__(None, opts, prefix)
+        self.reports = reports
+
+    def write(self, k, addr, line):
+        report = self.reports.get(addr)
+        if report is None:
+            report = self.reports[addr] = DeveloperReport([], {})
+        report.lines.append(line)
+        report.keys.setdefault(id(k), k)
+
+
+def format_report(report):
+    """
+    Return the text of DeveloperReport @report: the issue lines,
+    followed by summaries of the keys with issues.
+    """
+
+    return ''.join(report.lines) + ''.join(
+        '\n' + format_key_summary(k) for k in report.keys.values())
+
+
+def write_report(path, report):
+    """
+    Write DeveloperReport @report into file @path.
+    """
+
+    with open(path, 'w', encoding='UTF-8') as f:
+        f.write(format_report(report))
+
+
+def write_reports(directory, reports, jobs=None):
+    """
+    Write @reports (a dict of DeveloperReports by developer address)
+    into @directory, one file per developer, using a pool of @jobs
+    threads.  Returns the list of written paths.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, report_filename(addr))
+             for addr in reports]
+    with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+        # consume the results to propagate exceptions
+        list(executor.map(write_report, paths, reports.values()))
+    return paths
+
+
+def bug_url(addr, report):
+    """
+    Return the URL for filing a bug about DeveloperReport @report
+    of developer @addr, with the summary and comment filled in.
+    """
+
+    params = dict(BUG_FIELDS)
+    params['assigned_to'] = addr
+    params['short_desc'] = BUG_SUMMARY.format(addr.split('@')[0])
+    params['comment'] = BUG_COMMENT.format(format_report(report))
+    return BUG_URL + '?' + urllib.parse.urlencode(params)
+
+
+def bug_message(addr, report):
+    """
+    Return an e-mail message with the bug bundle for DeveloperReport
+    @report of developer @addr: the bug summary as the subject,
+    the URL for filing the bug and the bug comment as the body.
+    """
+
+    msg = email.message.EmailMessage()
+    msg['From'] = BUG_SENDER
+    msg['To'] = addr
+    msg['Subject'] = BUG_SUMMARY.format(addr.split('@')[0])
+    msg.set_content('{}\n\n{}'.format(
+        bug_url(addr, report), BUG_COMMENT.format(format_report(report))))
+    return msg
+
+
+def bug_bundle_exists(path, maildir=False):
+    """
+    Return True if mbox file @path (or Maildir @path if @maildir
+    is True) exists and contains messages.
+    """
+
+    if maildir:
+        return (os.path.isdir(path)
+                and len(mailbox.Maildir(path, create=False)) > 0)
+    return os.path.exists(path) and os.path.getsize(path) > 0
+
+
+def write_bug_bundle(path, reports, maildir=False):
+    """
+    Write bug bundles for @reports (a dict of DeveloperReports
+    by developer address) into mbox file @path, or Maildir @path
+    if @maildir is True.  Only developers with @gentoo.org addresses
+    are included.  Returns the number of written bundles.
+
+    Raises FileExistsError if the mailbox contains messages already,
+    so that bugs are not filed twice.
+    """
+
+    if bug_bundle_exists(path, maildir):
+        raise FileExistsError('Mailbox {} is not empty'.format(path))
+    if maildir:
+        box = mailbox.Maildir(path, create=True)
+    else:
+        box = mailbox.mbox(path, create=True)
+    ret = 0
+    box.lock()
+    try:
+        for addr, report in reports.items():
+            if not addr.endswith('@gentoo.org'):
+                continue
+            box.add(bug_message(addr, report))
+            ret += 1
+        box.flush()
+    finally:
+        box.unlock()
+        box.close()
+    return ret
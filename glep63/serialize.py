@@ -0,0 +1,242 @@
+# glep63-check -- serialization of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import collections
+import datetime
+import hashlib
+import json
+
+from glep63.base import (FAIL, WARN, Key, PublicKey, UID, KeyAlgo,
+        Validity, Description)
+
+
+ISSUE_CLASSES = dict((cls.__name__, cls) for cls in FAIL + WARN
+                     if cls is not None)
+
+# compact representation of an issue: the key is referenced by its
+# index in KeyRegistry, subkey or UID by its index in the key
+IssueRecord = collections.namedtuple('IssueRecord',
+    ('key', 'cls', 'ref', 'machine_desc', 'template', 'args'))
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def key_digest(k):
+    """
+    Return a digest of parsed key data of @k (including subkeys
+    and UIDs), suitable as a cache key.
+    """
+
+    return hashlib.sha256(repr(k).encode('UTF-8')).hexdigest()
+
+
+def issue_id(i):
+    """
+    Return the identity of issue @i that is preserved between checks
+    (and runs): a tuple of key fingerprint, issue class (so that
+    a warning becoming an error is a different issue), subkey keyid
+    or UID (empty string for issues of the primary key)
+    and machine_desc.
+    """
+
+    if hasattr(i, 'subkey'):
+        ref = i.subkey.keyid
+    elif hasattr(i, 'uid'):
+        ref = i.uid.user_id
+    else:
+        ref = ''
+    return (i.key.fingerprint or i.key.keyid, i.__class__.__name__, ref,
+            i.machine_desc)
+
+
+def encode_date(d):
+    if d is None:
+        return None
+    return (d - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def decode_date(d):
+    if d is None:
+        return None
+    return EPOCH + datetime.timedelta(microseconds=d)
+
+
+def encode_key_fields(k):
+    return [k.validity.value, k.key_length, int(k.key_algo), k.keyid,
+            encode_date(k.creation_date), encode_date(k.expiration_date),
+            k.key_caps, k.curve]
+
+
+def decode_key_fields(data):
+    (validity, key_length, key_algo, keyid, creation_date,
+     expiration_date, key_caps, curve) = data
+    return (Validity(validity), key_length, KeyAlgo(key_algo), keyid,
+            decode_date(creation_date), decode_date(expiration_date),
+            key_caps, curve)
+
+
+def encode_key(k):
+    """
+    Encode PublicKey @k as a compact, JSON-compatible list of plain
+    values.
+    """
+
+    return [encode_key_fields(k),
+            [encode_key_fields(sk) for sk in k.subkeys],
+            [[u.validity.value, encode_date(u.creation_date),
+              encode_date(u.expiration_date), u.uid_hash, u.user_id]
+             for u in k.uids],
+            k.overflow, k.fingerprint]
+
+
+def decode_key(data):
+    """
+    Decode PublicKey from @data created by encode_key().
+    """
+
+    fields, subkeys, uids, overflow, fingerprint = data
+    return PublicKey(*decode_key_fields(fields),
+        subkeys=[Key(*decode_key_fields(sk)) for sk in subkeys],
+        uids=[UID(Validity(validity), decode_date(creation_date),
+                  decode_date(expiration_date), uid_hash, user_id)
+              for validity, creation_date, expiration_date, uid_hash,
+              user_id in uids],
+        overflow=overflow, fingerprint=fingerprint)
+
+
+def encode_arg(v):
+    if isinstance(v, datetime.datetime):
+        return {'datetime': v.isoformat()}
+    return v
+
+
+def decode_arg(v):
+    if isinstance(v, dict):
+        return datetime.datetime.fromisoformat(v['datetime'])
+    return v
+
+
+class KeyRegistry(object):
+    """
+    Table of keys referenced by IssueRecords.
+    """
+
+    def __init__(self, keys=()):
+        self.keys = []
+        self._indexes = {}
+        self._refs = {}
+        for k in keys:
+            self.add(k)
+
+    def add(self, k):
+        """
+        Add key @k to the registry (if not present yet) and return
+        its index.
+        """
+
+        ret = self._indexes.get(id(k))
+        if ret is None:
+            ret = len(self.keys)
+            self.keys.append(k)
+            self._indexes[id(k)] = ret
+        return ret
+
+    def record(self, i):
+        """
+        Return IssueRecord for issue @i, adding its key to the registry
+        if necessary.
+        """
+
+        index = self.add(i.key)
+        ref = None
+        if hasattr(i, 'subkey') or hasattr(i, 'uid'):
+            refs = self._refs.get(index)
+            if refs is None:
+                refs = {}
+                for j, x in enumerate(i.key.subkeys):
+                    refs[id(x)] = j
+                for j, x in enumerate(i.key.uids):
+                    refs[id(x)] = j
+                self._refs[index] = refs
+            ref = refs[id(i.subkey if hasattr(i, 'subkey') else i.uid)]
+        return IssueRecord(index, i.__class__.__name__, ref,
+                           i.machine_desc, i.long_desc.template,
+                           tuple(i.long_desc.args))
+
+    def issue(self, r):
+        """
+        Return issue for IssueRecord @r.
+        """
+
+        k = self.keys[r.key]
+        cls = ISSUE_CLASSES[r.cls]
+        if 'subkey' in cls._fields:
+            params = (k, k.subkeys[r.ref])
+        elif 'uid' in cls._fields:
+            params = (k, k.uids[r.ref])
+        else:
+            params = (k,)
+        return cls(*params, r.machine_desc, Description(r.template, r.args))
+
+
+def encode_record(r):
+    """
+    Encode IssueRecord @r as a JSON-compatible list, without the key
+    reference.
+    """
+
+    return [r.cls, r.ref, r.machine_desc, r.template,
+            [encode_arg(a) for a in r.args]]
+
+
+def decode_record(data, key=0):
+    cls, ref, machine_desc, template, args = data
+    return IssueRecord(key, cls, ref, machine_desc, template,
+                       tuple(decode_arg(a) for a in args))
+
+
+def encode_issues(k, issues):
+    """
+    Encode @issues found for key @k into a JSON-compatible list.
+    Subkeys and UIDs are referenced by their index in @k.
+    """
+
+    registry = KeyRegistry([k])
+    return [encode_record(registry.record(i)) for i in issues]
+
+
+def decode_issues(k, data):
+    """
+    Decode issues for key @k from @data created by encode_issues().
+    """
+
+    registry = KeyRegistry([k])
+    return [registry.issue(decode_record(x)) for x in data]
+
+
+def dump_results(f, registry, records):
+    """
+    Write IssueRecords @records (a dict of lists of IssueRecords
+    by name, e.g. of the spec) along with all keys from KeyRegistry
+    @registry into text stream @f, as JSON.  Every key is written only
+    once, no matter how many issues refer to it.
+    """
+
+    json.dump({
+        'keys': [encode_key(k) for k in registry.keys],
+        'issues': dict((name, [[r.key] + encode_record(r) for r in recs])
+                       for name, recs in records.items()),
+    }, f)
+
+
+def load_results(f):
+    """
+    Load results written by dump_results() from text stream @f.
+    Returns a tuple of KeyRegistry and dict of lists of IssueRecords.
+    """
+
+    data = json.load(f)
+    registry = KeyRegistry(decode_key(k) for k in data['keys'])
+    return registry, dict((name, [decode_record(r[1:], r[0]) for r in recs])
+                          for name, recs in data['issues'].items())
@@ -0,0 +1,107 @@
+# glep63-check -- snapshots of check results and comparing against them
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import os
+import os.path
+
+from glep63.serialize import (KeyRegistry, dump_results, issue_id,
+        load_results)
+
+
+# kinds of changes against a snapshot
+NEW = 'new'
+RESOLVED = 'resolved'
+
+
+class Snapshot(object):
+    """
+    Results of a run against a number of specs, for comparing future
+    runs against.
+    """
+
+    def __init__(self):
+        self.registry = KeyRegistry()
+        self.records = {}
+
+    def add(self, name, keyret):
+        """
+        Add issues @keyret found for a key against spec @name.
+        """
+
+        records = self.records.setdefault(name, [])
+        for i in keyret:
+            records.append(self.registry.record(i))
+
+    def issues(self, name):
+        """
+        Return the list of issues against spec @name.
+        """
+
+        return [self.registry.issue(r) for r in self.records.get(name, ())]
+
+    def dump(self, f):
+        """
+        Write the snapshot into text stream @f, as JSON.
+        """
+
+        dump_results(f, self.registry, self.records)
+
+    def save(self, path):
+        """
+        Write the snapshot into file @path, replacing it atomically.
+        """
+
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='UTF-8') as f:
+                self.dump(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, f):
+        """
+        Load a snapshot written by dump() from text stream @f.
+        """
+
+        ret = cls()
+        ret.registry, ret.records = load_results(f)
+        return ret
+
+
+class SnapshotDiff(object):
+    """
+    Comparison of new results against @old_issues found in a previous
+    run.  Issues are matched by issue_id().
+    """
+
+    def __init__(self, old_issues):
+        self.old = dict((issue_id(i), i) for i in old_issues)
+        self.seen = set()
+
+    def new(self, keyret):
+        """
+        Return the issues from @keyret that were not found previously,
+        and record the remaining ones as still present.
+        """
+
+        ret = []
+        for i in keyret:
+            iid = issue_id(i)
+            if iid in self.old:
+                self.seen.add(iid)
+            else:
+                ret.append(i)
+        return ret
+
+    def resolved(self):
+        """
+        Return the previously found issues that were not passed
+        to new() since, in the original order.
+        """
+
+        return [i for iid, i in self.old.items() if iid not in self.seen]
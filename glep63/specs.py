@@ -2,6 +2,10 @@
 # (c) 2018 Michał Górny
 # Released under the terms of 2-clause BSD license.
 
+import collections
+import fnmatch
+import hashlib
+
 from glep63.base import (WARN, FAIL, Years, Days)
 
 
@@ -98,3 +102,207 @@ SPECS = {
 }
 
 DEFAULT_SPEC = 'glep63-2.1'
+
+
+# rules specific to key type ('key' or 'subkey'); issue_cls
+# and warning_cls are issue constructors for that key type
+KeyTypeRules = collections.namedtuple('KeyTypeRules',
+    ('issue_cls', 'warning_cls', 'expire_max', 'expire_recommended',
+     'expire_str'))
+
+# spec with all values resolved; expire thresholds are in days
+CompiledSpec = collections.namedtuple('CompiledSpec',
+    ('fingerprint', 'subkey_types',
+     'algo_dsa', 'dsa_minlength', 'rsa_minlength', 'rsa_recommended',
+     'algo_ecc', 'algo_invalid',
+     'key', 'subkey',
+     'expire_short_fail', 'expire_short_fail_str',
+     'expire_short_warn', 'expire_short_warn_str',
+     'subkey_multipurpose', 'subkey_none', 'uid_nogentoo', 'rules'))
+
+# machine-readable descriptions of all issues reported, i.e. the rules
+# that can be selected via select_rules()
+RULES = (
+    'validity:invalid', 'validity:revoked', 'validity:expired',
+    'limit:uids', 'limit:subkeys', 'limit:records', 'limit:bytes',
+    'algo:rsa:deprecated_only', 'algo:dsa', 'algo:dsa:tooshort',
+    'algo:dsa:discouraged', 'algo:rsa:tooshort', 'algo:rsa:short',
+    'algo:ecc', 'algo:ecc:invalid', 'algo:invalid',
+    'expire:none', 'expire:long', 'expire:short',
+    'subkey:multipurpose', 'subkey:none:s', 'subkey:none:e',
+    'uid:nogentoo',
+)
+
+
+def spec_fingerprint(spec):
+    """
+    Return a stable digest of spec dict @spec, suitable as a cache key.
+    """
+
+    def norm(v):
+        if v is FAIL:
+            return 'FAIL'
+        elif v is WARN:
+            return 'WARN'
+        elif isinstance(v, (Years, Days)):
+            return '{}:{}'.format(v.__class__.__name__, v)
+        elif isinstance(v, list):
+            return tuple(v)
+        return v
+
+    items = sorted((k, norm(v)) for k, v in spec.items()
+                   if k != '__doc__')
+    return hashlib.sha256(repr(items).encode('UTF-8')).hexdigest()
+
+
+def compile_key_type(spec, key_type):
+    expire_max = spec.get('expire:max:{}'.format(key_type))
+    expire_recommended = spec.get('expire:recommended:{}'.format(key_type))
+    if expire_recommended is not None:
+        expire_str = ('<{} recommended, {} max'
+                .format(expire_recommended, expire_max))
+    else:
+        expire_str = '{} max'.format(expire_max)
+
+    return KeyTypeRules(
+        getattr(FAIL, key_type),
+        getattr(WARN, key_type),
+        expire_max.days if expire_max is not None else None,
+        (expire_recommended.days if expire_recommended is not None
+         else None),
+        expire_str)
+
+
+def compile_spec(spec):
+    """
+    Compile spec dict @spec into a CompiledSpec.  Compiled specs
+    are cached, so the work is done once per spec dict.  If @spec is
+    already compiled, it is returned as-is.
+    """
+
+    if isinstance(spec, CompiledSpec):
+        return spec
+
+    cached = _compiled_specs.get(id(spec))
+    if cached is not None and cached[0] is spec:
+        return cached[1]
+
+    # we currently don't have to implement forbidding RSA ;-)
+    assert not spec.get('algo:rsa')
+    # ECC warnings are not used at the moment
+    assert spec.get('algo:ec25519') in (FAIL, None)
+
+    short_fail = spec.get('expire:short:fail')
+    short_warn = spec.get('expire:short:warn')
+    ret = CompiledSpec(
+        fingerprint=spec_fingerprint(spec),
+        subkey_types=tuple(spec['__subkey_types__']),
+        algo_dsa=spec.get('algo:dsa'),
+        dsa_minlength=spec.get('algo:dsa:minlength', 0),
+        rsa_minlength=spec.get('algo:rsa:minlength', 0),
+        rsa_recommended=spec.get('algo:rsa:recommended', 0),
+        algo_ecc=spec.get('algo:ec25519'),
+        algo_invalid=spec.get('algo:invalid'),
+        key=compile_key_type(spec, 'key'),
+        subkey=compile_key_type(spec, 'subkey'),
+        expire_short_fail=(short_fail.days if short_fail is not None
+                           else None),
+        expire_short_fail_str=str(short_fail),
+        expire_short_warn=(short_warn.days if short_warn is not None
+                           else None),
+        expire_short_warn_str=str(short_warn),
+        subkey_multipurpose=spec.get('subkey:multipurpose'),
+        subkey_none=spec.get('subkey:none'),
+        uid_nogentoo=spec.get('uid:nogentoo'),
+        rules=None,
+    )
+    # keep a reference to spec, so that its id() is not reused
+    _compiled_specs[id(spec)] = (spec, ret)
+    return ret
+
+
+_compiled_specs = {}
+
+
+def select_rules(spec, only=None, skip=None):
+    """
+    Return @spec compiled and restricted to the rules matching any
+    of fnmatch patterns in @only (all rules if None) and none
+    of the patterns in @skip.  Rules are named after machine-readable
+    descriptions of the issues, see RULES.
+
+    Issues of rules that are not selected are not reported.  When all
+    rules of the expiration or UID checks are skipped, these checks are
+    not evaluated at all.  Raises ValueError if a pattern does not
+    match any rule.
+    """
+
+    spec = compile_spec(spec)
+    if only is None and skip is None:
+        return spec
+
+    for pattern in (only or []) + (skip or []):
+        if not fnmatch.filter(RULES, pattern):
+            raise ValueError('Pattern {} does not match any rule'
+                             .format(pattern))
+
+    def matches(rule, patterns):
+        return any(fnmatch.fnmatchcase(rule, p) for p in patterns)
+
+    rules = frozenset(r for r in RULES
+                      if (only is None or matches(r, only))
+                      and not matches(r, skip or []))
+    if spec.rules is not None:
+        rules &= spec.rules
+
+    replace = {}
+    if not any(r.startswith('expire:') for r in rules):
+        replace.update(
+            key=spec.key._replace(expire_max=None, expire_recommended=None),
+            subkey=spec.subkey._replace(expire_max=None,
+                                        expire_recommended=None),
+            expire_short_fail=None,
+            expire_short_warn=None)
+    if 'uid:nogentoo' not in rules:
+        replace['uid_nogentoo'] = None
+
+    fingerprint = hashlib.sha256(repr((spec.fingerprint, sorted(rules)))
+                                 .encode('UTF-8')).hexdigest()
+    return spec._replace(fingerprint=fingerprint, rules=rules, **replace)
+
+
+def drop_warnings(spec):
+    """
+    Return @spec compiled with the rules that can only produce warnings
+    disabled, for when warnings are not going to be used.  Rules that
+    can produce both errors and warnings keep reporting errors.
+    """
+
+    spec = compile_spec(spec)
+    rules = frozenset(RULES) if spec.rules is None else spec.rules
+    rules -= {'algo:rsa:deprecated_only'}
+    # multipurpose subkeys still must not count as subkeys of their types
+    if spec.subkey_multipurpose == WARN:
+        rules -= {'subkey:multipurpose'}
+
+    def key_type_rules(rules):
+        # without max, expire:none is a warning
+        if rules.expire_max is None:
+            return rules
+        return rules._replace(expire_recommended=None)
+
+    replace = {}
+    for field in ('algo_dsa', 'algo_invalid', 'subkey_none', 'uid_nogentoo'):
+        if getattr(spec, field) == WARN:
+            replace[field] = None
+
+    fingerprint = hashlib.sha256(repr((spec.fingerprint, 'errors-only'))
+                                 .encode('UTF-8')).hexdigest()
+    return spec._replace(
+        fingerprint=fingerprint,
+        rsa_recommended=0,
+        key=key_type_rules(spec.key),
+        subkey=key_type_rules(spec.subkey),
+        expire_short_warn=None,
+        rules=rules,
+        **replace)
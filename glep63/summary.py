@@ -0,0 +1,90 @@
+# glep63-check -- summary counts of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import collections
+import itertools
+
+from glep63.base import (FAIL,)
+from glep63.batch import (CHUNK_SIZE, check_keys_specs)
+from glep63.check import (EvaluationContext,)
+from glep63.specs import (compile_spec,)
+
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# summary of checking keys against a single spec: number of keys
+# checked, number of keys with errors and with warnings (only),
+# and a Counter of issues by (severity, machine_desc)
+Summary = collections.namedtuple('Summary',
+    ('keys', 'error_keys', 'warning_keys', 'issues'))
+
+
+class SummaryCounter(object):
+    """
+    Counts of check results against a single spec, updated as results
+    for subsequent keys are added.
+    """
+
+    def __init__(self):
+        self.keys = 0
+        self.error_keys = 0
+        self.warning_keys = 0
+        self.issues = collections.Counter()
+
+    def add(self, k, keyret):
+        """
+        Add check results @keyret for key @k.
+        """
+
+        self.keys += 1
+        if not keyret:
+            return
+        has_errors = False
+        for i in keyret:
+            if type(i) in FAIL:
+                has_errors = True
+                self.issues[ERROR, i.machine_desc] += 1
+            else:
+                self.issues[WARNING, i.machine_desc] += 1
+        if has_errors:
+            self.error_keys += 1
+        else:
+            self.warning_keys += 1
+
+    def summary(self):
+        """
+        Return the Summary of results added so far.
+        """
+
+        return Summary(self.keys, self.error_keys, self.warning_keys,
+                       self.issues)
+
+
+def summarize_keys(keys, specs, context=None, chunk_size=CHUNK_SIZE):
+    """
+    Check @keys against all @specs and count the results.  Returns
+    a list of Summary for every spec.
+
+    @keys can be any iterable.  Keys are checked in chunks of
+    @chunk_size and neither them nor the issues found are kept
+    afterwards, so the memory use does not depend on the number of keys.
+    """
+
+    specs = [compile_spec(spec) for spec in specs]
+    if context is None:
+        context = EvaluationContext()
+
+    counters = [SummaryCounter() for spec in specs]
+    keys = iter(keys)
+    while True:
+        chunk = list(itertools.islice(keys, chunk_size))
+        if not chunk:
+            break
+        results = check_keys_specs(chunk, specs, context)
+        for counter, spec_results in zip(counters, results):
+            for k, keyret in zip(chunk, spec_results):
+                counter.add(k, keyret)
+
+    return [counter.summary() for counter in counters]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# Benchmark checking keys with many subkeys and UIDs.
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import argparse
+import datetime
+import sys
+import timeit
+
+sys.path.insert(0, '.')
+
+from glep63.base import (PublicKey, Key, UID, KeyAlgo, Validity)
+from glep63.check import (EvaluationContext, check_key)
+from glep63.output import (TextOutput,)
+from glep63.specs import (SPECS, DEFAULT_SPEC)
+
+
+NOW = datetime.datetime(2026, 1, 1)
+
+
+def subkey(i, validity, expiration_days):
+    return Key(
+        validity=validity,
+        key_length=4096,
+        key_algo=KeyAlgo.RSA,
+        keyid='{:016X}'.format(i),
+        creation_date=NOW - datetime.timedelta(days=1000),
+        expiration_date=NOW + datetime.timedelta(days=expiration_days),
+        key_caps='se'[i % 2],
+        curve='',
+    )
+
+
+def pathological_key(n):
+    """
+    Return a key with @n subkeys and @n UIDs, most of them expired,
+    the remaining subkeys expiring soon, plus one good subkey
+    of every type.
+    """
+
+    subkeys = []
+    for i in range(n):
+        if i % 4:
+            subkeys.append(subkey(i, Validity.EXPIRED, -10))
+        else:
+            subkeys.append(subkey(i, Validity.NO_VALUE, 5))
+    subkeys += [subkey(n, Validity.NO_VALUE, 365), subkey(n+1, Validity.NO_VALUE, 365)]
+
+    uids = [UID(
+                validity=Validity.EXPIRED if i % 4 else Validity.NO_VALUE,
+                creation_date=NOW - datetime.timedelta(days=1000),
+                expiration_date=None,
+                uid_hash='{:040X}'.format(i),
+                user_id='Developer {0} <dev{0}@example.com>'.format(i),
+            ) for i in range(n)]
+
+    return PublicKey(
+        validity=Validity.NO_VALUE,
+        key_length=4096,
+        key_algo=KeyAlgo.RSA,
+        keyid='0000000000000000',
+        creation_date=NOW - datetime.timedelta(days=1000),
+        expiration_date=NOW + datetime.timedelta(days=365),
+        key_caps='sc',
+        curve='',
+        subkeys=subkeys,
+        uids=uids,
+    )
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('-n', '--repeat', type=int, default=5,
+                      help='Number of repetitions per size')
+    argp.add_argument('sizes', type=int, nargs='*',
+                      default=[250, 500, 1000, 2000, 4000],
+                      help='Numbers of subkeys and UIDs to test')
+    args = argp.parse_args()
+
+    spec = SPECS[DEFAULT_SPEC]
+    context = EvaluationContext(NOW)
+    opts = argparse.Namespace(errors_only=False, warnings_as_errors=False,
+                              ignore_extraneous_keys=False,
+                              grouped_input=False, machine_readable=True,
+                              no_name=False)
+
+    def print_results(keys, results):
+        out = TextOutput(sys.stdout, opts)
+        for k, keyret in zip(keys, results):
+            out.add(k, keyret)
+        return out.close()
+
+    print('{:>8} {:>12} {:>12} {:>12}'.format('size', 'check [ms]',
+                                              'print [ms]', 'per item [µs]'))
+    for n in args.sizes:
+        k = pathological_key(n)
+        results = [check_key(k, spec, context)]
+        check_time = min(timeit.repeat(
+            lambda: check_key(k, spec, context),
+            number=1, repeat=args.repeat))
+        with open('/dev/null', 'w') as null:
+            stdout, sys.stdout = sys.stdout, null
+            try:
+                print_time = min(timeit.repeat(
+                    lambda: print_results([k], results),
+                    number=1, repeat=args.repeat))
+            finally:
+                sys.stdout = stdout
+        print('{:>8} {:>12.2f} {:>12.2f} {:>12.2f}'.format(
+            n, check_time * 1000, print_time * 1000,
+            (check_time + print_time) / n * 1000000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# Benchmark printing results for a keyring full of broken keys.
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import argparse
+import datetime
+import email.utils
+import io
+import sys
+import timeit
+
+sys.path.insert(0, '.')
+
+from glep63.base import (PublicKey, Key, UID, KeyAlgo, Validity, FAIL,
+        KeyIssue, KeyWarning, SubKeyIssue, SubKeyWarning)
+from glep63.check import (EvaluationContext, check_key)
+from glep63.output import (TextOutput,)
+from glep63.specs import (SPECS, DEFAULT_SPEC)
+
+
+NOW = datetime.datetime(2026, 1, 1)
+
+
+def broken_key(i, subkeys, uids):
+    """
+    Return key number @i with 1024-bit DSA primary key without
+    expiration date, @subkeys short-lived subkeys and @uids UIDs.
+    """
+
+    def key(j, caps, expiration_date):
+        return Key(
+            validity=Validity.NO_VALUE,
+            key_length=1024,
+            key_algo=KeyAlgo.DSA,
+            keyid='{:08X}{:08X}'.format(i, j),
+            creation_date=NOW - datetime.timedelta(days=1000),
+            expiration_date=expiration_date,
+            key_caps=caps,
+            curve='',
+        )
+
+    return PublicKey(
+        *key(0, 'scSC', None),
+        subkeys=[key(j + 1, 'se'[j % 2], NOW + datetime.timedelta(days=5))
+                 for j in range(subkeys)],
+        uids=[UID(
+                validity=Validity.NO_VALUE,
+                creation_date=NOW - datetime.timedelta(days=1000),
+                expiration_date=None,
+                uid_hash='{:020X}{:020X}'.format(i, j),
+                user_id='Developer {0} <dev{0}@gentoo.org>'.format(i),
+              ) for j in range(uids)],
+        fingerprint='{:040X}'.format(i),
+    )
+
+
+def print_per_issue(f, keys, results, opts):
+    """
+    Print results recomputing the primary UID, its address and keyid
+    fields for every issue, as a reference.
+    """
+
+    for k, keyret in zip(keys, results):
+        for i in keyret:
+            for u in i.key.uids:
+                if u.validity in (Validity.REVOKED, Validity.EXPIRED):
+                    continue
+                break
+            else:
+                u = i.key.uids[0]
+            addr = email.utils.parseaddr(u.user_id)[1]
+            if type(i) in (KeyIssue, KeyWarning):
+                keyid = i.key.keyid
+            elif type(i) in (SubKeyIssue, SubKeyWarning):
+                keyid = '{}:{}'.format(i.key.keyid, i.subkey.keyid)
+            else:
+                keyid = '{}:[{}]'.format(
+                    i.key.keyid,
+                    email.utils.parseaddr(i.uid.user_id)[1]
+                    if opts.no_name else i.uid.user_id)
+            if opts.machine_readable:
+                msg = [keyid, i.machine_desc]
+            else:
+                msg = [keyid, '[{}]'.format(addr if opts.no_name
+                                            else u.user_id),
+                       '[E]' if type(i) in FAIL else '[W]',
+                       i.machine_desc, str(i.long_desc)]
+            f.write(' '.join(msg) + '\n')
+
+
+def print_text(f, keys, results, opts):
+    out = TextOutput(f, opts)
+    for k, keyret in zip(keys, results):
+        out.add(k, keyret)
+    out.close()
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('-k', '--keys', type=int, default=2000,
+                      help='Number of keys in the keyring')
+    argp.add_argument('-s', '--subkeys', type=int, default=20,
+                      help='Number of subkeys per key')
+    argp.add_argument('-u', '--uids', type=int, default=5,
+                      help='Number of UIDs per key')
+    argp.add_argument('-n', '--repeat', type=int, default=5,
+                      help='Number of repetitions')
+    args = argp.parse_args()
+
+    spec = SPECS[DEFAULT_SPEC]
+    context = EvaluationContext(NOW)
+    keys = [broken_key(i, args.subkeys, args.uids)
+            for i in range(args.keys)]
+    results = [check_key(k, spec, context) for k in keys]
+    nissues = sum(len(keyret) for keyret in results)
+
+    print('{} keys, {} issues'.format(len(keys), nissues))
+    print('{:>24} {:>12} {:>14}'.format('', 'total [ms]', 'per issue [µs]'))
+    for machine_readable in (True, False):
+        for no_name in (False, True):
+            opts = argparse.Namespace(errors_only=False,
+                                      warnings_as_errors=False,
+                                      ignore_extraneous_keys=False,
+                                      grouped_input=False,
+                                      machine_readable=machine_readable,
+                                      no_name=no_name)
+            outputs = [io.StringIO(), io.StringIO()]
+            print_per_issue(outputs[0], keys, results, opts)
+            print_text(outputs[1], keys, results, opts)
+            assert outputs[0].getvalue() == outputs[1].getvalue()
+
+            for name, func in (('per-issue', print_per_issue),
+                               ('per-key', print_text)):
+                t = min(timeit.repeat(
+                    lambda: func(io.StringIO(), keys, results, opts),
+                    number=1, repeat=args.repeat))
+                label = '{} {}{}'.format(
+                    name, '-m' if machine_readable else '  ',
+                    ' -N' if no_name else '')
+                print('{:>24} {:>12.2f} {:>14.2f}'.format(
+                    label, t * 1000, t / nissues * 1000000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# Benchmark the startup time of glep63-check, checking a single key.
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import argparse
+import compileall
+import os.path
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from tests.test_key_algos import (RSA4096GoodKeyTest,)
+
+
+def import_time(python, module):
+    """
+    Return the cumulative import time of @module in µs, as reported
+    by "python -X importtime".
+    """
+
+    s = subprocess.run([python, '-X', 'importtime', '-c',
+                        'import ' + module],
+                       stderr=subprocess.PIPE, check=True,
+                       universal_newlines=True).stderr
+    for l in s.splitlines():
+        fields = [x.strip() for x in l.split('|')]
+        if fields[-1] == module:
+            return int(fields[1])
+    raise RuntimeError('{} not found in importtime output'.format(module))
+
+
+def run_time(args, stdin=None):
+    """
+    Return the wall time of running @args, in seconds.
+    """
+
+    start = time.perf_counter()
+    subprocess.run(args, input=stdin, stdout=subprocess.DEVNULL,
+                   universal_newlines=True)
+    return time.perf_counter() - start
+
+
+def main():
+    argp = argparse.ArgumentParser()
+    argp.add_argument('-n', '--repeat', type=int, default=10,
+                      help='Number of repetitions (the best time is used)')
+    argp.add_argument('--max-import', type=float, default=40,
+                      metavar='MS',
+                      help='Fail if importing glep63.cli takes more than MS '
+                           'milliseconds (default: 40)')
+    argp.add_argument('--max-run', type=float, default=60,
+                      metavar='MS',
+                      help='Fail if checking a single key takes more than MS '
+                           'milliseconds over the interpreter startup '
+                           '(default: 60)')
+    args = argp.parse_args()
+
+    # make sure that the bytecode is used, as for installed packages
+    compileall.compile_dir(os.path.join(os.path.dirname(__file__), '..',
+                                        'glep63'), quiet=1)
+    python = sys.executable
+
+    import_us = min(import_time(python, 'glep63.cli')
+                    for i in range(args.repeat))
+    base = min(run_time([python, '-c', 'pass'])
+               for i in range(args.repeat))
+    colons = RSA4096GoodKeyTest.GPG_COLONS.lstrip()
+    check = min(run_time([python, '-m', 'glep63', '-G', '-', '--no-cache'],
+                         colons)
+                for i in range(args.repeat))
+
+    print('{:<32} {:>8.2f} ms'.format('import glep63.cli', import_us / 1000))
+    print('{:<32} {:>8.2f} ms'.format('interpreter startup', base * 1000))
+    print('{:<32} {:>8.2f} ms'.format('single key check (over startup)',
+                                      (check - base) * 1000))
+
+    ret = 0
+    if import_us / 1000 > args.max_import:
+        print('import time exceeds {} ms'.format(args.max_import))
+        ret = 1
+    if (check - base) * 1000 > args.max_run:
+        print('single key check time exceeds {} ms'.format(args.max_run))
+        ret = 1
+    return ret
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,7 +9,10 @@ import subprocess
 import unittest
 import unittest.mock
 
-from glep63.check import (check_key,)
+import glep63.batch
+import glep63.optional
+from glep63.batch import (check_keys,)
+from glep63.check import (EvaluationContext, check_key, check_key_specs)
 from glep63.gnupg import (process_gnupg_key, process_gnupg_colons,
                           spawn_gnupg)
 from glep63.specs import (SPECS,)
@@ -25,10 +28,8 @@ class FakeTimePopen(subprocess.Popen):
                     'faketime is required to run GPG integration tests')
 
 
-class PatchedDateTime(datetime.datetime):
-    @classmethod
-    def utcnow(self):
-        return datetime.datetime(2018, 8, 3)
+# evaluation context matching the time used to generate test keys
+CONTEXT = EvaluationContext(datetime.datetime(2018, 8, 3))
 
 
 def clear_long_descs(it):
@@ -70,12 +71,11 @@ class BaseKeyTest(unittest.TestCase):
         """
         keys = [self.KEY]
 
-        with unittest.mock.patch("datetime.datetime", PatchedDateTime):
-            for spec, expected in self.EXPECTED_RESULTS.items():
-                with self.subTest(spec):
-                    self.assertListEqual(expected,
-                            list(clear_long_descs(
-                                check_key(keys[0], SPECS[spec]))))
+        for spec, expected in self.EXPECTED_RESULTS.items():
+            with self.subTest(spec):
+                self.assertListEqual(expected,
+                        list(clear_long_descs(
+                            check_key(keys[0], SPECS[spec], CONTEXT))))
 
     def test_colons(self):
         """
@@ -84,12 +84,11 @@ class BaseKeyTest(unittest.TestCase):
         keys = process_gnupg_colons(io.StringIO(self.GPG_COLONS))
         assert len(keys) == 1
 
-        with unittest.mock.patch("datetime.datetime", PatchedDateTime):
-            for spec, expected in self.EXPECTED_RESULTS.items():
-                with self.subTest(spec):
-                    self.assertListEqual(expected,
-                            list(clear_long_descs(
-                                check_key(keys[0], SPECS[spec]))))
+        for spec, expected in self.EXPECTED_RESULTS.items():
+            with self.subTest(spec):
+                self.assertListEqual(expected,
+                        list(clear_long_descs(
+                            check_key(keys[0], SPECS[spec], CONTEXT))))
 
     def test_integration(self):
         """
@@ -103,9 +102,36 @@ class BaseKeyTest(unittest.TestCase):
             keys = process_gnupg_key(keyrings=[keypath])
         assert len(keys) == 1
 
-        with unittest.mock.patch("datetime.datetime", PatchedDateTime):
-            for spec, expected in self.EXPECTED_RESULTS.items():
-                with self.subTest(spec):
-                    self.assertListEqual(expected,
-                            list(clear_long_descs(
-                                check_key(keys[0], SPECS[spec]))))
+        for spec, expected in self.EXPECTED_RESULTS.items():
+            with self.subTest(spec):
+                self.assertListEqual(expected,
+                        list(clear_long_descs(
+                            check_key(keys[0], SPECS[spec], CONTEXT))))
+
+    def test_check_keys(self):
+        """
+        Test the key using batch check_keys() API.
+        """
+        keys = [self.KEY]
+
+        for numpy in (glep63.optional.load_numpy(), None):
+            with unittest.mock.patch("glep63.optional.numpy", numpy), \
+                    unittest.mock.patch("glep63.batch.NUMPY_MIN_KEYS", 0):
+                for spec, expected in self.EXPECTED_RESULTS.items():
+                    with self.subTest(spec, numpy=numpy is not None):
+                        self.assertListEqual([expected],
+                                [list(clear_long_descs(r)) for r in
+                                 check_keys(keys, SPECS[spec], CONTEXT)])
+
+    def test_check_key_specs(self):
+        """
+        Test the key against all specs at once.
+        """
+        specs = sorted(self.EXPECTED_RESULTS)
+
+        results = check_key_specs(self.KEY, [SPECS[s] for s in specs],
+                                  CONTEXT)
+        for spec, result in zip(specs, results):
+            with self.subTest(spec):
+                self.assertListEqual(self.EXPECTED_RESULTS[spec],
+                                     list(clear_long_descs(result)))
@@ -0,0 +1,33 @@
+# glep63-check -- tests for base types
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import unittest
+
+from glep63.base import (Description,)
+from glep63.check import (check_key,)
+from glep63.specs import (SPECS,)
+
+import tests.test_key_other
+
+
+class DescriptionTest(unittest.TestCase):
+    def test_static(self):
+        self.assertEqual('Subkey is invalid',
+                         str(Description('Subkey is invalid')))
+
+    def test_args(self):
+        self.assertEqual('RSA key short (has 2048 bits, 4096 bits recommended)',
+                         str(Description('RSA key short (has {} bits, {} bits '
+                                         'recommended)', (2048, 4096))))
+
+    def test_shared(self):
+        """
+        Test that issues of the same kind share their description.
+        """
+        key = tests.test_key_other.ExpiredKeyTest.KEY
+        spec = SPECS['glep63-2.1']
+        first, = check_key(key, spec)
+        second, = check_key(key, spec)
+        self.assertIs(first.long_desc, second.long_desc)
+        self.assertEqual('Public key has expired', str(first.long_desc))
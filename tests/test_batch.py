@@ -0,0 +1,66 @@
+# glep63-check -- tests for batch checking
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import unittest
+import unittest.mock
+
+import glep63.batch
+import glep63.optional
+from glep63.batch import (check_keys,)
+from glep63.check import (check_key,)
+from glep63.specs import (SPECS,)
+
+import tests.key_base
+import tests.test_key_algos
+import tests.test_key_expiration
+import tests.test_key_other
+
+
+def all_test_keys():
+    for mod in (tests.test_key_algos, tests.test_key_expiration,
+                tests.test_key_other):
+        for v in vars(mod).values():
+            if (isinstance(v, type)
+                    and issubclass(v, tests.key_base.BaseKeyTest)):
+                yield v.KEY
+
+
+class CheckKeysTest(unittest.TestCase):
+    maxDiff = None
+
+    def test_whole_keyring(self):
+        """
+        Test that checking all test keys at once matches check_key().
+        """
+        keys = list(all_test_keys())
+
+        context = tests.key_base.CONTEXT
+        for numpy in (glep63.optional.load_numpy(), None):
+            with unittest.mock.patch("glep63.optional.numpy", numpy), \
+                    unittest.mock.patch("glep63.batch.NUMPY_MIN_KEYS", 0):
+                for spec in SPECS.values():
+                    with self.subTest(spec['__doc__'],
+                                      numpy=numpy is not None):
+                        self.assertListEqual(
+                                [check_key(k, spec, context) for k in keys],
+                                check_keys(keys, spec, context))
+
+    def test_small_batch(self):
+        """
+        Test that NumPy is not imported for checking a few keys.
+        """
+        keys = list(all_test_keys())[:glep63.batch.NUMPY_MIN_KEYS - 1]
+
+        with unittest.mock.patch("glep63.optional.numpy",
+                                 glep63.optional.UNLOADED):
+            self.assertListEqual(
+                    [check_key(k, SPECS['glep63-2'], tests.key_base.CONTEXT)
+                     for k in keys],
+                    check_keys(keys, SPECS['glep63-2'],
+                               tests.key_base.CONTEXT))
+            self.assertIs(glep63.optional.numpy,
+                          glep63.optional.UNLOADED)
+
+    def test_empty(self):
+        self.assertListEqual([], check_keys([], SPECS['glep63-2.1']))
@@ -0,0 +1,130 @@
+# glep63-check -- tests for the result cache
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import datetime
+import os.path
+import sqlite3
+import tempfile
+import unittest
+import unittest.mock
+
+from glep63.cache import (ResultCache, check_keys_cached)
+from glep63.check import (EvaluationContext, check_key, verdict_instants)
+from glep63.specs import (SPECS, compile_spec)
+
+import tests.key_base
+import tests.test_key_expiration
+from tests.test_batch import (all_test_keys,)
+
+
+CONTEXT = tests.key_base.CONTEXT
+SPEC = compile_spec(SPECS['glep63-2.1'])
+
+
+class VerdictInstantsTest(unittest.TestCase):
+    def test_constant_between_instants(self):
+        """
+        Test that results do not change between consecutive instants.
+        """
+        usec = datetime.timedelta(microseconds=1)
+        for k in all_test_keys():
+            for name, spec in SPECS.items():
+                spec = compile_spec(spec)
+                instants = verdict_instants(k, spec)
+                for t1, t2 in zip(instants, instants[1:]):
+                    with self.subTest(name, key=k.keyid, t1=t1):
+                        self.assertListEqual(
+                            check_key(k, spec, EvaluationContext(t1 + usec)),
+                            check_key(k, spec, EvaluationContext(t2)))
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hit(self):
+        keys = list(all_test_keys())
+        with ResultCache(self.path) as cache:
+            first = check_keys_cached(keys, [SPEC], CONTEXT, cache)
+        with ResultCache(self.path) as cache:
+            second = check_keys_cached(keys, [SPEC], CONTEXT, cache)
+            self.assertEqual(len(keys), cache.stats['hits'])
+            self.assertEqual(0, cache.stats['misses'])
+        self.assertListEqual(first, second)
+        self.assertListEqual([[check_key(k, SPEC, CONTEXT) for k in keys]],
+                             second)
+
+    def test_stale(self):
+        k = tests.test_key_expiration.PrimaryKeyTwoYearExpirationTest.KEY
+        with ResultCache(self.path) as cache:
+            check_keys_cached([k], [SPEC], CONTEXT, cache)
+        # the key is close to expiration now
+        context = EvaluationContext(k.expiration_date
+                                    - datetime.timedelta(days=10))
+        with ResultCache(self.path) as cache:
+            result = check_keys_cached([k], [SPEC], context, cache)
+            self.assertEqual(1, cache.stats['stale'])
+        self.assertListEqual([[check_key(k, SPEC, context)]], result)
+
+    def test_multiple_specs(self):
+        keys = list(all_test_keys())
+        specs = [compile_spec(s) for s in SPECS.values()]
+        with ResultCache(self.path) as cache:
+            check_keys_cached(keys, specs[:2], CONTEXT, cache)
+        with ResultCache(self.path) as cache:
+            result = check_keys_cached(keys, specs, CONTEXT, cache)
+            self.assertEqual(2 * len(keys), cache.stats['hits'])
+        self.assertListEqual([[check_key(k, s, CONTEXT) for k in keys]
+                              for s in specs], result)
+
+    def test_eviction(self):
+        keys = list(all_test_keys())
+        with ResultCache(self.path, max_entries=5) as cache:
+            check_keys_cached(keys, [SPEC], CONTEXT, cache)
+        self.assertEqual(len(keys) - 5, cache.stats['evictions'])
+        with ResultCache(self.path, max_entries=5) as cache:
+            check_keys_cached(keys, [SPEC], CONTEXT, cache)
+            self.assertEqual(5, cache.stats['hits'])
+
+    def test_concurrent(self):
+        keys = list(all_test_keys())
+        with ResultCache(self.path, timeout=0) as cache1:
+            with ResultCache(self.path, timeout=0) as cache2:
+                check_keys_cached(keys, [SPEC], CONTEXT, cache1)
+                result = check_keys_cached(keys, [SPEC], CONTEXT, cache2)
+                self.assertEqual(len(keys), cache2.stats['hits'])
+        self.assertIsNone(cache1.error)
+        self.assertIsNone(cache2.error)
+        self.assertListEqual([[check_key(k, SPEC, CONTEXT) for k in keys]],
+                             result)
+
+    def test_locked(self):
+        keys = list(all_test_keys())
+        with ResultCache(self.path, timeout=0) as cache:
+            db = sqlite3.connect(self.path)
+            db.execute('BEGIN EXCLUSIVE')
+            try:
+                result = check_keys_cached(keys, [SPEC], CONTEXT, cache)
+            finally:
+                db.close()
+        self.assertIsInstance(cache.error, sqlite3.OperationalError)
+        self.assertListEqual([[check_key(k, SPEC, CONTEXT) for k in keys]],
+                             result)
+
+    def test_version(self):
+        keys = list(all_test_keys())
+        with ResultCache(self.path) as cache:
+            check_keys_cached(keys, [SPEC], CONTEXT, cache)
+        with unittest.mock.patch('glep63.cache.CACHE_VERSION', 'other'):
+            with ResultCache(self.path) as cache:
+                check_keys_cached(keys, [SPEC], CONTEXT, cache)
+                self.assertEqual(0, cache.stats['hits'])
+                self.assertEqual(len(keys), cache.stats['stores'])
+            with ResultCache(self.path) as cache:
+                check_keys_cached(keys, [SPEC], CONTEXT, cache)
+                self.assertEqual(len(keys), cache.stats['hits'])
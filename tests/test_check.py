@@ -0,0 +1,41 @@
+# glep63-check -- tests for checking helpers
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import email.utils
+import unittest
+
+from glep63.check import (uid_email,)
+
+from tests.test_batch import (all_test_keys,)
+
+
+class UIDEmailTest(unittest.TestCase):
+    USER_IDS = [
+        'GLEP63 test key <nobody@gentoo.org>',
+        'Michał Górny <mgorny@gentoo.org>',
+        'John Q. Public <john.q.public@example.com>',
+        '<nobody@gentoo.org>',
+        'nobody@gentoo.org',
+        'Foo "Bar" Baz <foo@example.com>',
+        'Foo (Bar) <foo@example.com>',
+        'Foo <foo@example.com> (Bar)',
+        'Foo, Bar <foo@example.com>',
+        'Foo <foo..bar@example.com>',
+        'Foo <foo bar@example.com>',
+        'Foo <"foo bar"@example.com>',
+        'Foo <foo@[127.0.0.1]>',
+        'Foo <foo@example.com',
+        'Foo < foo@example.com >',
+        'Foo <>',
+        'Foo',
+        '',
+    ]
+
+    def test_same_as_parseaddr(self):
+        user_ids = self.USER_IDS + [u.user_id for k in all_test_keys()
+                                    for u in k.uids]
+        for user_id in user_ids:
+            with self.subTest(user_id):
+                self.assertEqual(uid_email(user_id),
+                                 email.utils.parseaddr(user_id)[1])
@@ -0,0 +1,351 @@
+# glep63-check -- tests for the command-line interface
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os.path
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from glep63.batch import (CheckedKeys,)
+from glep63.cli import (OutputSink, check_chunks, main, parse_output,
+                        parse_timestamp, positive_int, sink_options)
+
+import tests.key_base
+import tests.test_key_algos
+import tests.test_key_expiration
+import tests.test_key_other
+
+
+def all_test_colons():
+    for mod in (tests.test_key_algos, tests.test_key_expiration,
+                tests.test_key_other):
+        for v in vars(mod).values():
+            if (isinstance(v, type)
+                    and issubclass(v, tests.key_base.BaseKeyTest)):
+                yield v.GPG_COLONS.lstrip()
+
+
+def run_main(argv):
+    """
+    Run main() with command-line arguments @argv.  Returns a tuple
+    of the exit status and stdout.
+    """
+
+    f = io.StringIO()
+    with unittest.mock.patch('sys.argv', ['glep63-check'] + list(argv)):
+        with contextlib.redirect_stdout(f):
+            ret = main()
+    return ret, f.getvalue()
+
+
+class PendingChunk(object):
+    """
+    Fake check result that is not ready until get() is called.
+    """
+
+    def __init__(self, test, keys):
+        self.test = test
+        self.keys = keys
+
+    def ready(self):
+        return False
+
+    def get(self):
+        self.test.in_flight -= 1
+        return [[[k] for k in self.keys]]
+
+
+class CheckChunksTest(unittest.TestCase):
+    def submit(self, keys, specs, context):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return PendingChunk(self, keys)
+
+    def test_pending(self):
+        self.in_flight = self.max_in_flight = 0
+        ret = list(check_chunks(iter(range(10)), [None], None, self.submit,
+                                3, 2))
+        self.assertListEqual(ret, [
+            ([0, 1, 2], [[[0], [1], [2]]]),
+            ([3, 4, 5], [[[3], [4], [5]]]),
+            ([6, 7, 8], [[[6], [7], [8]]]),
+            ([9], [[[9]]]),
+        ])
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_ready(self):
+        # results that are ready are yielded before reading more keys
+        keys = iter(range(10))
+        it = check_chunks(keys, [None], None,
+                          lambda keys, specs, context: CheckedKeys(
+                              [[[k] for k in keys]]),
+                          3, 4)
+        self.assertEqual(next(it), ([0, 1, 2], [[[0], [1], [2]]]))
+        self.assertListEqual(list(keys), list(range(3, 10)))
+
+
+class PositiveIntTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(positive_int('4'), 4)
+        for arg in ('0', '-1', 'foo'):
+            with self.subTest(arg):
+                self.assertRaises(argparse.ArgumentTypeError,
+                                  positive_int, arg)
+
+    def test_options(self):
+        for args in (['-j', '0'], ['--cache-size', '-1']):
+            with self.subTest(args=args):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    with self.assertRaises(SystemExit):
+                        run_main(['-G', '-'] + args)
+
+
+class ParseTimestampTest(unittest.TestCase):
+    def test_parse(self):
+        expected = datetime.datetime(2018, 8, 3, 12, 30)
+        for arg in ('2018-08-03T12:30:00', '2018-08-03 12:30',
+                    '2018-08-03T12:30:00+00:00', '2018-08-03T12:30:00Z',
+                    '2018-08-03T14:30:00+02:00'):
+            with self.subTest(arg):
+                self.assertEqual(parse_timestamp(arg), expected)
+
+    def test_invalid(self):
+        self.assertRaises(argparse.ArgumentTypeError, parse_timestamp,
+                          '03.08.2018')
+
+
+class ParseOutputTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_output('text=out.txt'),
+                         OutputSink('text', (), 'out.txt'))
+        self.assertEqual(parse_output('machine:errors-only,no-name=-'),
+                         OutputSink('machine', ('errors-only', 'no-name'),
+                                    '-'))
+        self.assertEqual(parse_output('summary=a=b'),
+                         OutputSink('summary', (), 'a=b'))
+
+    def test_invalid(self):
+        for arg in ('text', 'text=', 'foo=out.txt',
+                    'text:foo=out.txt'):
+            with self.subTest(arg):
+                self.assertRaises(argparse.ArgumentTypeError,
+                                  parse_output, arg)
+
+    def test_sink_options(self):
+        opts = argparse.Namespace(format='text', summary=None,
+                                  machine_readable=False, errors_only=False,
+                                  warnings_as_errors=True, no_name=False)
+        sopts = sink_options(opts, parse_output(
+            'machine:errors-only=out.txt'))
+        self.assertTrue(sopts.machine_readable)
+        self.assertTrue(sopts.errors_only)
+        self.assertTrue(sopts.warnings_as_errors)
+        self.assertFalse(opts.errors_only)
+        self.assertEqual(sink_options(opts, parse_output(
+            'summary-json=-')).summary, 'json')
+        self.assertEqual(sink_options(opts, parse_output(
+            'ndjson=-')).format, 'ndjson')
+
+
+class MultipleOutputsTest(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.colons = os.path.join(self.tmpdir.name, 'keys.txt')
+        with open(self.colons, 'w', encoding='UTF-8') as f:
+            f.writelines(all_test_colons())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_main(self, *args):
+        return run_main(['-G', self.colons, '--no-cache', '--as-of',
+                         tests.key_base.CONTEXT.now.isoformat()]
+                        + list(args))
+
+    def test_same_as_separate_runs(self):
+        runs = [
+            ('text', []),
+            ('machine', ['-m']),
+            ('text:errors-only', ['-e']),
+            ('ndjson', ['--format', 'ndjson']),
+            ('summary', ['--summary']),
+            ('summary-json:errors-only', ['--summary', 'json', '-e']),
+            ('machine:warnings-as-errors,no-name', ['-m', '-w', '-N']),
+        ]
+        for specs in ([], ['-S', 'glep63-2', '-S', 'glep63-1-strict']):
+            with self.subTest(specs=specs):
+                args = list(specs)
+                for n, (sink, opts) in enumerate(runs):
+                    args += ['--output', '{}={}'.format(
+                        sink, os.path.join(self.tmpdir.name, str(n)))]
+                ret, stdout = self.run_main(*args)
+                self.assertEqual(stdout, '')
+
+                expected_ret = 0
+                for n, (sink, opts) in enumerate(runs):
+                    sret, expected = self.run_main(*(specs + opts))
+                    expected_ret |= sret
+                    with open(os.path.join(self.tmpdir.name, str(n)),
+                              encoding='UTF-8') as f:
+                        self.assertEqual(f.read(), expected)
+                self.assertEqual(ret, expected_ret)
+
+
+class ErrorsOnlyTest(unittest.TestCase):
+    # one developer with a key having only a warning, and a key
+    # having an error
+    ERROR_LINE = ('8968FF836C750226 [GLEP63 test key <nobody@gentoo.org>] '
+                  '[E] algo:rsa:tooshort RSA key too short (has 1024 bits, '
+                  'should be at least 2048 bits)\n')
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.colons = os.path.join(self.tmpdir.name, 'keys.txt')
+        with open(self.colons, 'w', encoding='UTF-8') as f:
+            f.write(tests.test_key_expiration
+                    .PrimaryKeyThreeWeekExpirationTest.GPG_COLONS.lstrip())
+            f.write(tests.test_key_algos.RSA1024Sub4096Test
+                    .GPG_COLONS.lstrip())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_main(self, *args):
+        return run_main(['-G', self.colons, '--no-cache',
+                         '--as-of', '2018-08-03'] + list(args))
+
+    def test_ignore_extraneous_keys(self):
+        self.assertEqual(self.run_main('-e', '-i'), (1, self.ERROR_LINE))
+
+    def test_output_ignore_extraneous_keys(self):
+        path = os.path.join(self.tmpdir.name, 'out.txt')
+        self.assertEqual(self.run_main(
+            '--output', 'text:errors-only,ignore-extraneous-keys=' + path),
+            (1, ''))
+        with open(path, encoding='UTF-8') as f:
+            self.assertEqual(f.read(), self.ERROR_LINE)
+
+
+class FloodedKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.colons = os.path.join(self.tmpdir.name, 'keys.txt')
+        lines = [l + '\n' for l in tests.test_key_algos.RSA4096GoodKeyTest
+                 .GPG_COLONS.strip().splitlines()]
+        # flooded key, exceeding the byte limit in its only UID
+        uid = lines[3].split(':')
+        uid[9] = 'x' * (5 * 1024 * 1024)
+        with open(self.colons, 'w', encoding='UTF-8') as f:
+            f.writelines(lines[1:3] + [':'.join(uid)] + lines[4:]
+                         + lines[1:])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_no_uids(self):
+        for args in ([], ['-i'], ['-N']):
+            with self.subTest(args=args):
+                self.assertEqual(
+                    run_main(['-G', self.colons, '--no-cache', '-m',
+                              '--as-of', '2018-08-03'] + args),
+                    (1, '0F2446E70C90BD31 limit:bytes\n'))
+
+    def test_report_dir(self):
+        report_dir = os.path.join(self.tmpdir.name, 'reports')
+        self.assertEqual(run_main(['-G', self.colons, '--no-cache',
+                                   '--as-of', '2018-08-03',
+                                   '--report-dir', report_dir]), (1, ''))
+        self.assertEqual(os.listdir(report_dir), ['0F2446E70C90BD31.txt'])
+
+
+class DiffAgainstTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.colons = os.path.join(self.tmpdir.name, 'keys.txt')
+        with open(self.colons, 'w', encoding='UTF-8') as f:
+            f.write(tests.test_key_expiration
+                    .PrimaryKeyThreeWeekExpirationTest.GPG_COLONS.lstrip())
+        self.snapshot = os.path.join(self.tmpdir.name, 'snapshot.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_main(self, as_of, *args):
+        return run_main(['-G', self.colons, '--no-cache', '-m',
+                         '--as-of', as_of] + list(args))
+
+    def test_warning_to_error(self):
+        self.assertEqual(self.run_main('2018-08-03', '--save-snapshot',
+                                       self.snapshot)[0], 0)
+        self.assertEqual(self.run_main('2018-08-12', '--diff-against',
+                                       self.snapshot),
+                         (1, '+ 0C03DAC68D7CAAA4 expire:short\n'
+                             '- 0C03DAC68D7CAAA4 expire:short\n'))
+        self.assertEqual(self.run_main('2018-08-12', '--diff-against',
+                                       self.snapshot, '-q'), (1, ''))
+
+
+class LoadErrorTest(unittest.TestCase):
+    def test_gnupg_failure(self):
+        if not tests.key_base.get_gnupg_version():
+            raise unittest.SkipTest('GnuPG executable not found')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.chmod(tmpdir, 0o700)
+            stderr = io.StringIO()
+            with unittest.mock.patch.dict(os.environ, GNUPGHOME=tmpdir):
+                with contextlib.redirect_stderr(stderr):
+                    self.assertEqual(run_main(['-k', 'nobody@example.com',
+                                               '--no-cache']), (4, ''))
+        self.assertIn('Unable to load keys', stderr.getvalue())
+
+    def test_verify_signer_requires_signature(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                run_main(['-d', '--verify-signer', '0' * 40])
+
+
+class StartupTest(unittest.TestCase):
+    # modules that must not be loaded for checking a few keys
+    LAZY_MODULES = ('numpy', 'orjson', 'urllib.request', 'email.utils',
+                    'mailbox', 'multiprocessing', 'tempfile',
+                    'glep63.forecast', 'glep63.parallel', 'glep63.report')
+
+    SCRIPT = '''
+import json
+import os
+import sys
+
+from glep63.cli import main
+
+sys.argv[0] = 'glep63-check'
+with open(os.devnull, 'w') as f:
+    sys.stdout = f
+    main()
+    sys.stdout = sys.__stdout__
+print(json.dumps(sorted(sys.modules)))
+'''
+
+    def test_lazy_imports(self):
+        with tempfile.NamedTemporaryFile('w', encoding='UTF-8') as f:
+            f.write(tests.test_key_other.ExpiredKeyTest.GPG_COLONS.lstrip())
+            f.flush()
+            s = subprocess.run(
+                [sys.executable, '-c', self.SCRIPT, '-G', f.name,
+                 '--no-cache'],
+                stdout=subprocess.PIPE, check=True,
+                cwd=os.path.join(os.path.dirname(__file__), '..'),
+                universal_newlines=True).stdout
+        modules = json.loads(s)
+        self.assertIn('glep63.check', modules)
+        self.assertListEqual([m for m in self.LAZY_MODULES if m in modules],
+                             [])
@@ -0,0 +1,81 @@
+# glep63-check -- tests for evaluation context
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import datetime
+import unittest
+
+from glep63.check import (EvaluationContext, EXPIRE_OK, EXPIRE_NONE,
+        EXPIRE_LONG_FAIL, EXPIRE_LONG_WARN, EXPIRE_SHORT_FAIL,
+        EXPIRE_SHORT_WARN, expire_verdict)
+from glep63.specs import (SPECS, compile_spec)
+
+
+def reference_verdict(spec, key_type, now, expiration_date):
+    """
+    Compute the verdict using timedelta arithmetic, the way it was
+    done before the cut-offs were introduced.
+    """
+    rules = getattr(spec, key_type)
+    if rules.expire_max is None and rules.expire_recommended is None:
+        return EXPIRE_OK
+    if expiration_date is None:
+        return EXPIRE_NONE
+    days = (expiration_date - now).days
+    if rules.expire_max is not None and days > rules.expire_max:
+        return EXPIRE_LONG_FAIL
+    elif (rules.expire_recommended is not None
+            and days > rules.expire_recommended):
+        return EXPIRE_LONG_WARN
+    elif (spec.expire_short_fail is not None
+            and days < spec.expire_short_fail):
+        return EXPIRE_SHORT_FAIL
+    elif (spec.expire_short_warn is not None
+            and days < spec.expire_short_warn):
+        return EXPIRE_SHORT_WARN
+    return EXPIRE_OK
+
+
+class EvaluationContextTest(unittest.TestCase):
+    NOW = datetime.datetime(2018, 8, 3, 23, 59, 30)
+
+    def test_thresholds(self):
+        """
+        Test expiration dates around all thresholds.
+        """
+        context = EvaluationContext(self.NOW)
+        offsets = [datetime.timedelta(seconds=s)
+                   for s in (-86401, -86400, -86399, -1, 0, 1, 86399)]
+
+        for name, spec in SPECS.items():
+            spec = compile_spec(spec)
+            cutoffs = context.cutoffs(spec)
+            days = set([0])
+            for v in (spec.key.expire_max, spec.key.expire_recommended,
+                      spec.subkey.expire_max,
+                      spec.subkey.expire_recommended,
+                      spec.expire_short_fail, spec.expire_short_warn):
+                if v is not None:
+                    days.update((int(v) - 1, int(v), int(v) + 1,
+                                 int(v) + 2))
+
+            for key_type in ('key', 'subkey'):
+                for d in sorted(days):
+                    for off in offsets:
+                        exp = self.NOW + datetime.timedelta(days=d) + off
+                        with self.subTest(name, key_type=key_type, exp=exp):
+                            self.assertEqual(
+                                reference_verdict(spec, key_type,
+                                                  self.NOW, exp),
+                                expire_verdict(spec, cutoffs, key_type,
+                                               exp))
+
+    def test_cached(self):
+        context = EvaluationContext(self.NOW)
+        spec = compile_spec(SPECS['glep63-2.1'])
+        self.assertIs(context.cutoffs(spec), context.cutoffs(spec))
+
+    def test_default_now(self):
+        before = datetime.datetime.utcnow()
+        context = EvaluationContext()
+        self.assertLessEqual(before, context.now)
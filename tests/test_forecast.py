@@ -0,0 +1,64 @@
+# glep63-check -- tests for forecasting result changes
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import datetime
+import unittest
+
+from glep63.base import (Validity,)
+from glep63.check import (EvaluationContext, check_key)
+from glep63.forecast import (forecast_key, key_as_of)
+from glep63.serialize import (issue_id,)
+from glep63.specs import (SPECS,)
+
+import tests.key_base
+import tests.test_key_expiration
+from tests.test_batch import (all_test_keys,)
+
+
+START = tests.key_base.CONTEXT.now
+
+
+class ForecastTest(unittest.TestCase):
+    def test_against_daily_checks(self):
+        """
+        Test that applying the forecast events gives the same results
+        as checking the key every few days.
+        """
+        end = START + datetime.timedelta(days=1000)
+        for k in all_test_keys():
+            for name, spec in SPECS.items():
+                with self.subTest(name, key=k.keyid):
+                    events = forecast_key(k, spec, START, end)
+                    state = set(issue_id(i) for i in check_key(
+                        key_as_of(k, START), spec,
+                        EvaluationContext(START)))
+
+                    t = START
+                    while t < end:
+                        t += datetime.timedelta(days=3, seconds=1)
+                        while events and events[0].time <= t:
+                            ev = events.pop(0)
+                            state -= set(issue_id(i) for i in ev.removed)
+                            state |= set(issue_id(i) for i in ev.added)
+                        self.assertSetEqual(
+                            set(issue_id(i) for i in check_key(
+                                key_as_of(k, t), spec,
+                                EvaluationContext(t))),
+                            state, t)
+
+    def test_expiration(self):
+        k = tests.test_key_expiration.PrimaryKeyTwoYearExpirationTest.KEY
+        events = forecast_key(k, SPECS['glep63-2.1'], START,
+                              k.expiration_date
+                              + datetime.timedelta(days=1))
+        self.assertEqual(k.expiration_date, events[-1].time.replace(
+            microsecond=0))
+        self.assertListEqual(['validity:expired'],
+                             [i.machine_desc for i in events[-1].added])
+
+    def test_key_as_of(self):
+        k = tests.test_key_expiration.PrimaryKeyTwoYearExpirationTest.KEY
+        self.assertIs(k.subkeys, key_as_of(k, START).subkeys)
+        self.assertEqual(Validity.EXPIRED,
+                         key_as_of(k, k.expiration_date).validity)
@@ -0,0 +1,176 @@
+# glep63-check -- tests for GnuPG helpers
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import io
+import os
+import os.path
+import subprocess
+import tempfile
+import unittest
+import unittest.mock
+
+from glep63.base import (KeyIssue, Description)
+from glep63.check import (TEMPLATE_LIMIT, check_key)
+from glep63.gnupg import (KeyLimits, NO_LIMITS, SignatureError,
+                          copy_verified, spawn_gnupg, iter_gnupg_colons,
+                          process_gnupg_colons, process_gnupg_key)
+from glep63.specs import (SPECS,)
+
+import tests.key_base
+import tests.test_key_other
+
+
+class CopyVerifiedTest(unittest.TestCase):
+    DATA = b'keyring data\n' * 10000
+
+    @classmethod
+    def setUpClass(cls):
+        if not tests.key_base.get_gnupg_version():
+            raise unittest.SkipTest('GnuPG executable not found')
+
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.env = dict(os.environ, GNUPGHOME=cls.tmpdir.name)
+        os.chmod(cls.tmpdir.name, 0o700)
+        cls.data_path = os.path.join(cls.tmpdir.name, 'data')
+        with open(cls.data_path, 'wb') as f:
+            f.write(cls.DATA)
+
+        for args in (['--quick-generate-key', 'GLEP63 test <nobody@gentoo.org>',
+                      'ed25519', 'sign', '1d'],
+                     ['--detach-sign', cls.data_path]):
+            with spawn_gnupg(['--batch', '--passphrase', '', '--quiet']
+                             + args, env=cls.env,
+                             stderr=subprocess.DEVNULL) as s:
+                if s.wait() != 0:
+                    raise unittest.SkipTest('Unable to create signature')
+
+        cls.sig_path = cls.data_path + '.sig'
+        with unittest.mock.patch.dict(os.environ, cls.env):
+            cls.fingerprint = process_gnupg_key()[0].fingerprint
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def verify(self, data, **kwargs):
+        out_f = io.BytesIO()
+        with unittest.mock.patch.dict(os.environ, self.env):
+            copy_verified(io.BytesIO(data), out_f, self.sig_path, **kwargs)
+        return out_f.getvalue()
+
+    def test_good(self):
+        self.assertEqual(self.DATA, self.verify(self.DATA))
+
+    def test_bad(self):
+        self.assertRaises(subprocess.CalledProcessError,
+                          self.verify, self.DATA + b'evil\n')
+
+    def test_signer(self):
+        self.assertEqual(self.DATA, self.verify(
+            self.DATA, signers=[self.fingerprint.lower()]))
+
+    def test_unexpected_signer(self):
+        self.assertRaises(SignatureError, self.verify, self.DATA,
+                          signers=['0' * 40])
+
+    def test_keyring(self):
+        # the signing key is not in the keyring
+        keyring = os.path.join(self.tmpdir.name, 'empty.gpg')
+        open(keyring, 'wb').close()
+        self.assertRaises(subprocess.CalledProcessError, self.verify,
+                          self.DATA, keyrings=[keyring])
+
+
+class KeyLimitsTest(unittest.TestCase):
+    BASE_TEST = tests.test_key_other.RevokedGentooUIDTest
+
+    def flooded_colons(self, count):
+        """
+        Return colon listing of the base test key followed by a key
+        flooded with @count UIDs and subkeys, and by the base test key
+        again.
+        """
+        lines = [l + '\n' for l in
+                 self.BASE_TEST.GPG_COLONS.strip().splitlines()]
+        pub = [l for l in lines if l.startswith(('pub:', 'fpr:'))][:2]
+        uid = [l for l in lines if l.startswith('uid:')][0]
+        sub = [l for l in lines if l.startswith('sub:')][0]
+        return ''.join(lines + pub + [uid] * count + [sub] * count + lines)
+
+    def test_no_overflow(self):
+        colons = self.flooded_colons(100)
+        keys = process_gnupg_colons(io.StringIO(colons))
+        self.assertEqual(len(keys), 3)
+        self.assertEqual([k.overflow for k in keys], [None] * 3)
+        self.assertEqual(len(keys[1].uids), 100)
+        self.assertEqual(keys, process_gnupg_colons(io.StringIO(colons),
+                                                    NO_LIMITS))
+
+    def test_limits(self):
+        colons = self.flooded_colons(100)
+        for limits, overflow, uids, subkeys in (
+                (NO_LIMITS._replace(uids=50), 'uids', 50, 0),
+                (NO_LIMITS._replace(subkeys=10), 'subkeys', 100, 10),
+                (NO_LIMITS._replace(records=120), 'records', 100, 19),
+                (NO_LIMITS._replace(bytes=1000), 'bytes', 8, 0),
+                (KeyLimits(50, 10, 120, 1000), 'bytes', 8, 0),
+                ):
+            with self.subTest(limits):
+                keys = process_gnupg_colons(io.StringIO(colons), limits)
+                self.assertEqual(len(keys), 3)
+                self.assertEqual(keys[0], self.BASE_TEST.KEY)
+                self.assertEqual(keys[2], self.BASE_TEST.KEY)
+                self.assertEqual(keys[1].overflow, overflow)
+                self.assertEqual(len(keys[1].uids), uids)
+                self.assertEqual(len(keys[1].subkeys), subkeys)
+
+    def test_bytes_utf8(self):
+        lines = [l + '\n' for l in
+                 self.BASE_TEST.GPG_COLONS.strip().splitlines()]
+        pub = [l for l in lines if l.startswith(('pub:', 'fpr:'))][:2]
+        uid = [l for l in lines if l.startswith('uid:')][0].split(':')
+        uid[9] = 'Zażółć gęślą jaźń' * 10
+        uid = ':'.join(uid)
+        # records following the pub record are counted
+        counted = pub[1:] + [uid]
+        chars = sum(len(l) for l in counted)
+        size = sum(len(l.encode('UTF-8')) for l in counted)
+        for limit, overflow in ((chars, 'bytes'), (size, None)):
+            with self.subTest(limit):
+                keys = process_gnupg_colons(io.StringIO(''.join(pub + [uid])),
+                                            NO_LIMITS._replace(bytes=limit))
+                self.assertEqual(keys[0].overflow, overflow)
+
+    def test_issue(self):
+        colons = self.flooded_colons(100)
+        keys = process_gnupg_colons(io.StringIO(colons),
+                                    NO_LIMITS._replace(uids=50))
+        for name, spec in SPECS.items():
+            with self.subTest(name):
+                self.assertListEqual(
+                    check_key(keys[1], spec, tests.key_base.CONTEXT),
+                    [KeyIssue(keys[1], 'limit:uids',
+                              Description(TEMPLATE_LIMIT, ('uids',)))])
+
+
+class IterColonsTest(unittest.TestCase):
+    def test_streaming(self):
+        """
+        Test that keys are yielded before the following records are read.
+        """
+        tests_ = [tests.test_key_other.ExpiredKeyTest,
+                  tests.test_key_other.RevokedKeyTest]
+
+        def lines():
+            for t in tests_:
+                yield from (l + '\n' for l in
+                            t.GPG_COLONS.strip().splitlines())
+            raise AssertionError('all lines read')
+
+        it = iter_gnupg_colons(lines())
+        self.assertEqual(next(it), tests_[0].KEY)
+        it.close()
+
+    def test_empty(self):
+        self.assertListEqual(list(iter_gnupg_colons(io.StringIO(''))), [])
@@ -65,6 +65,7 @@ fpr:::::::::229609A52A4F11CF6745835A7A9ABB819370914C:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -131,6 +132,7 @@ fpr:::::::::432C3A7F86B54FCA365B20E1D18FCB9CA5CF829A:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='1242E5978CF42CA392240E7DA25BE39105C7ECE2',
     )
 
     EXPECTED_RESULTS = {
@@ -209,6 +211,7 @@ fpr:::::::::8B50D9779B2729186AFC2AEA23409257D078B438:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -282,6 +285,7 @@ fpr:::::::::A721D7C7D46B53AC1750CC87C0CDDEE90139BC28:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='580D5B1A25E0FCEE17A2D8C58968FF836C750226',
     )
 
     EXPECTED_RESULTS = {
@@ -384,6 +388,7 @@ fpr:::::::::F875F3C4C7DA08C0E8E6D84842D2EC9482C50985:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='81F356D819C6EF96D7AC1FF5A3820AC4BFC9EA7B',
     )
 
     EXPECTED_RESULTS = {
@@ -486,6 +491,7 @@ fpr:::::::::27802BF224123FE218BE2157A8147FD627F36D82:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -600,6 +606,7 @@ fpr:::::::::4BCF2912F8CA08721A6F9FE015F2D6D394723D5A:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='BA5A6956B39769D03A74BA4BDE3C8B783203C4FB',
     )
 
     EXPECTED_RESULTS = {
@@ -702,6 +709,7 @@ fpr:::::::::1C9B67F422DEE6C6C557B186B3F692723809542E:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='5A4891EDB747391F18D42EA913447F0775EF5B7F',
     )
 
     EXPECTED_RESULTS = {
@@ -801,6 +809,7 @@ fpr:::::::::5BA1F267C46C783BAD52ECF29E8253E10FF514B5:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='509678D482A4F5DC2B22807B19F1BB7773CE59DB',
     )
 
     EXPECTED_RESULTS = {
@@ -64,6 +64,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -166,6 +167,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -250,6 +252,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -316,6 +319,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -418,6 +422,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -520,6 +525,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -622,6 +628,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -736,6 +743,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -850,6 +858,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -964,6 +973,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -1051,6 +1061,7 @@ fpr:::::::::CF8439AF79B439E0D9D7C99B44C9C2CFA6974493:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -1189,6 +1200,7 @@ fpr:::::::::F216FC6F6C4EC3AD4DE4A4AF2D927DAC6A85C6BD:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -1303,6 +1315,7 @@ fpr:::::::::5CB0AB96CC27B81BC863A49A5C86C94E1054CF0D:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='2CBB31F7106077B10497E2180C03DAC68D7CAAA4',
     )
 
     EXPECTED_RESULTS = {
@@ -1387,6 +1400,7 @@ fpr:::::::::5CB0AB96CC27B81BC863A49A5C86C94E1054CF0D:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='2CBB31F7106077B10497E2180C03DAC68D7CAAA4',
     )
 
     EXPECTED_RESULTS = {
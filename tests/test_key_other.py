@@ -52,6 +52,7 @@ fpr:::::::::A23A271C81A008C088BB0A2CD4E7C940C84DD0DA:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='723AADD29743D410B5CAD9CEDB44A8BC23B67AF4',
     )
 
     EXPECTED_RESULTS = {
@@ -142,6 +143,7 @@ fpr:::::::::A76730D5141B96EFAA7B3E4AF9FDA2910B574DA4:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='F0769AC027B2117ECFAB7F1BCD407D01E7D00880',
     )
 
     EXPECTED_RESULTS = {
@@ -232,6 +234,7 @@ fpr:::::::::F216FC6F6C4EC3AD4DE4A4AF2D927DAC6A85C6BD:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -322,6 +325,7 @@ fpr:::::::::F216FC6F6C4EC3AD4DE4A4AF2D927DAC6A85C6BD:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -453,6 +457,7 @@ fpr:::::::::F216FC6F6C4EC3AD4DE4A4AF2D927DAC6A85C6BD:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -533,6 +538,7 @@ fpr:::::::::C40C2A33B028C24C6FA21BF0D1DE5B31DBAB4E09:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -635,6 +641,7 @@ fpr:::::::::C40C2A33B028C24C6FA21BF0D1DE5B31DBAB4E09:
                 user_id='GLEP63 test key <nobody@example.com>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -737,6 +744,7 @@ fpr:::::::::C40C2A33B028C24C6FA21BF0D1DE5B31DBAB4E09:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
@@ -868,6 +876,7 @@ fpr:::::::::4BDEA4604CAABF8C158B66F731EF1F504A39CC46:
                 user_id='GLEP63 test key <nobody@gentoo.org>',
             ),
         ],
+        fingerprint='4D94D1CD1D552073A6579CE70F2446E70C90BD31',
     )
 
     EXPECTED_RESULTS = {
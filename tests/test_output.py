@@ -0,0 +1,186 @@
+# glep63-check -- tests for output of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import argparse
+import io
+import json
+import unittest
+import unittest.mock
+
+from glep63.base import (FAIL, Description, UIDIssue)
+from glep63.check import (check_key,)
+from glep63.output import (NDJSONOutput, TextOutput, format_issue,
+                           primary_uid)
+from glep63.specs import (SPECS,)
+
+import tests.key_base
+from tests.test_batch import (all_test_keys,)
+
+
+def make_opts(**kwargs):
+    opts = dict(errors_only=False, warnings_as_errors=False,
+                ignore_extraneous_keys=False, grouped_input=False,
+                machine_readable=True, no_name=False)
+    opts.update(kwargs)
+    return argparse.Namespace(**opts)
+
+
+def reference_output(keys, results, opts):
+    """
+    Format results the way the CLI originally did, after collecting
+    all of them.
+    """
+    good_devs = set()
+    msgs = []
+    for k, keyret in zip(keys, results):
+        if not keyret and opts.ignore_extraneous_keys:
+            good_devs.add(primary_uid(k)[1])
+        for i in keyret:
+            if opts.errors_only and type(i) not in FAIL:
+                continue
+            msgs.append(format_issue(i, opts))
+    return ''.join(' '.join(msg) + '\n' for addr, msg in msgs
+                   if addr not in good_devs)
+
+
+class ResultsMixin(object):
+    maxDiff = None
+
+    def setUp(self):
+        keys = list(all_test_keys())
+        # make a few developers with good and bad keys, not adjacent
+        self.keys = []
+        for n, k in enumerate(keys):
+            addr = 'dev{}@gentoo.org'.format(n % 5)
+            self.keys.append(k._replace(uids=[
+                u._replace(user_id='Developer <{}>'.format(addr))
+                for u in k.uids]))
+        self.results = [check_key(k, SPECS['glep63-2'],
+                                  tests.key_base.CONTEXT)
+                        for k in self.keys]
+        self.results[3] = []
+        self.results[10] = []
+
+
+class TextOutputTest(ResultsMixin, unittest.TestCase):
+    def write(self, keys, results, opts):
+        f = io.StringIO()
+        out = TextOutput(f, opts)
+        for k, keyret in zip(keys, results):
+            out.add(k, keyret)
+        return f, out.close()
+
+    def test_streaming(self):
+        opts = make_opts()
+        f = io.StringIO()
+        out = TextOutput(f, opts)
+        n = next(n for n, keyret in enumerate(self.results)
+                 if any(type(i) in FAIL for i in keyret))
+        out.add(self.keys[n], self.results[n])
+        # results are written before close()
+        self.assertNotEqual(f.getvalue(), '')
+        self.assertEqual(f.getvalue(),
+                         reference_output(self.keys[n:n+1],
+                                          self.results[n:n+1], opts))
+        self.assertEqual(out.close(), 1)
+
+    def test_same_as_reference(self):
+        for kwargs in ({}, {'errors_only': True},
+                       {'ignore_extraneous_keys': True},
+                       {'ignore_extraneous_keys': True, 'errors_only': True},
+                       {'machine_readable': False, 'no_name': True}):
+            opts = make_opts(**kwargs)
+            with self.subTest(**kwargs):
+                f, ret = self.write(self.keys, self.results, opts)
+                self.assertEqual(f.getvalue(),
+                                 reference_output(self.keys, self.results,
+                                                  opts))
+
+    def test_grouped_input(self):
+        order = sorted(range(len(self.keys)),
+                       key=lambda n: primary_uid(self.keys[n])[1])
+        keys = [self.keys[n] for n in order]
+        results = [self.results[n] for n in order]
+        opts = make_opts(ignore_extraneous_keys=True, grouped_input=True)
+        f, ret = self.write(keys, results, opts)
+        self.assertEqual(f.getvalue(),
+                         reference_output(keys, results, opts))
+
+    def test_uid_issue_no_name(self):
+        k = self.keys[0]
+        k = k._replace(uids=[k.uids[0]._replace(
+            user_id='Other Developer <other@example.com>')] + k.uids)
+        results = [[UIDIssue(k, k.uids[0], 'uid:nogentoo',
+                             Description('UID without @gentoo.org e-mail'))]]
+        for machine_readable, expected in (
+                (True, '{}:[other@example.com] uid:nogentoo\n'),
+                (False, '{}:[other@example.com] [dev0@gentoo.org] [E] '
+                        'uid:nogentoo UID without @gentoo.org e-mail\n')):
+            opts = make_opts(no_name=True, machine_readable=machine_readable)
+            with self.subTest(machine_readable=machine_readable):
+                f, ret = self.write([k], results, opts)
+                self.assertEqual(f.getvalue(), expected.format(k.keyid))
+                self.assertEqual(ret, 1)
+
+    def test_status(self):
+        for kwargs, ret in (({}, 1), ({'warnings_as_errors': True}, 3),
+                            ({'warnings_as_errors': True,
+                              'errors_only': True}, 1)):
+            with self.subTest(**kwargs):
+                self.assertEqual(self.write(self.keys, self.results,
+                                            make_opts(**kwargs))[1], ret)
+
+
+class NDJSONOutputTest(ResultsMixin, unittest.TestCase):
+    def ndjson(self, opts, spec=None, change=None):
+        f = io.StringIO()
+        out = NDJSONOutput(f, opts, spec, change)
+        for k, keyret in zip(self.keys, self.results):
+            out.add(k, keyret)
+        out.close()
+        return [json.loads(l) for l in f.getvalue().splitlines()]
+
+    def expected(self, opts, spec=None, change=None):
+        out = []
+        for k, keyret in zip(self.keys, self.results):
+            for i in keyret:
+                if opts.errors_only and type(i) not in FAIL:
+                    continue
+                data = {
+                    'fingerprint': k.fingerprint,
+                    'keyid': k.keyid,
+                    'subkey': (i.subkey.keyid if hasattr(i, 'subkey')
+                               else None),
+                    'uid': i.uid.user_id if hasattr(i, 'uid') else None,
+                    'developer': primary_uid(k)[1],
+                    'severity': 'error' if type(i) in FAIL else 'warning',
+                    'machine_desc': i.machine_desc,
+                }
+                if not opts.machine_readable:
+                    data['long_desc'] = str(i.long_desc)
+                if spec is not None:
+                    data['spec'] = spec
+                if change is not None:
+                    data['change'] = change
+                out.append(data)
+        return out
+
+    def test_ndjson(self):
+        import glep63.optional
+        encoders = [None]
+        if glep63.optional.load_orjson() is not None:
+            encoders.append(glep63.optional.orjson)
+        for orjson in encoders:
+            for kwargs, spec, change in (
+                    ({}, None, None),
+                    ({'machine_readable': False}, 'glep63-2', None),
+                    ({'errors_only': True}, None, None),
+                    ({}, 'glep63-2', 'resolved')):
+                opts = make_opts(**kwargs)
+                with self.subTest(orjson=orjson, spec=spec, change=change,
+                                  **kwargs):
+                    with unittest.mock.patch('glep63.optional.orjson', orjson):
+                        self.assertListEqual(
+                            self.ndjson(opts, spec, change),
+                            self.expected(opts, spec, change))
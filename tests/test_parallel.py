@@ -0,0 +1,40 @@
+# glep63-check -- tests for parallel checking
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import unittest
+
+from glep63.batch import (check_keys_specs,)
+from glep63.parallel import (ParallelChecker, check_keys_parallel)
+from glep63.specs import (SPECS, compile_spec)
+
+import tests.key_base
+from tests.test_batch import (all_test_keys,)
+
+
+class ParallelTest(unittest.TestCase):
+    maxDiff = None
+
+    def test_same_as_serial(self):
+        keys = list(all_test_keys())
+        context = tests.key_base.CONTEXT
+        for specs in (['glep63-2.1'], list(SPECS)):
+            specs = [compile_spec(SPECS[s]) for s in specs]
+            with self.subTest(len(specs)):
+                self.assertListEqual(
+                    check_keys_specs(keys, specs, context),
+                    check_keys_parallel(keys, specs, context, jobs=2,
+                                        chunk_size=5))
+
+    def test_checker_reused(self):
+        keys = list(all_test_keys())
+        context = tests.key_base.CONTEXT
+        all_specs = dict((s, compile_spec(SPECS[s])) for s in SPECS)
+        with ParallelChecker(2, context, all_specs.values(),
+                             chunk_size=5) as checker:
+            for specs in (['glep63-2.1'], list(SPECS), ['glep63-2']):
+                specs = [all_specs[s] for s in specs]
+                with self.subTest(len(specs)):
+                    self.assertListEqual(
+                        check_keys_specs(keys[:12], specs, context),
+                        checker(keys[:12], specs, context))
@@ -0,0 +1,148 @@
+# glep63-check -- tests for per-developer report files
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import contextlib
+import io
+import mailbox
+import os
+import os.path
+import tempfile
+import unittest
+import urllib.parse
+
+from glep63.output import (TextOutput, primary_uid)
+from glep63.report import (BUG_COMMENT, BUG_URL, DeveloperReport,
+                           ReportOutput, bug_bundle_exists, bug_url,
+                           format_key_summary, format_report,
+                           report_filename, write_bug_bundle, write_reports)
+
+import tests.test_key_other
+from tests.test_cli import (run_main,)
+from tests.test_output import (ResultsMixin, make_opts)
+
+
+class KeySummaryTest(unittest.TestCase):
+    def test_expired_key(self):
+        self.assertEqual(format_key_summary(
+            tests.test_key_other.ExpiredKeyTest.KEY), '''\
+pub   rsa4096 1999-12-31 [SC] [expired: 2000-01-01]
+      723AADD29743D410B5CAD9CEDB44A8BC23B67AF4
+uid           [ expired] GLEP63 test key <nobody@gentoo.org>
+sub   rsa4096 1999-12-31 [S] [expired: 2000-01-01]
+''')
+
+
+class ReportTest(ResultsMixin, unittest.TestCase):
+    def test_reports(self):
+        for kwargs in ({}, {'errors_only': True},
+                       {'ignore_extraneous_keys': True}):
+            opts = make_opts(**kwargs)
+            with self.subTest(**kwargs):
+                reports = {}
+                out = ReportOutput(reports, opts)
+                for k, keyret in zip(self.keys, self.results):
+                    out.add(k, keyret)
+                out.close()
+
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    paths = write_reports(tmpdir, reports, 4)
+                    self.assertEqual(sorted(os.listdir(tmpdir)),
+                                     sorted(report_filename(addr)
+                                            for addr in reports))
+                    self.assertEqual(len(paths), len(reports))
+
+                    for addr, report in reports.items():
+                        # lines the same as output for developer's keys
+                        f = io.StringIO()
+                        out = TextOutput(f, opts)
+                        for k, keyret in zip(self.keys, self.results):
+                            if primary_uid(k)[1] == addr:
+                                out.add(k, keyret)
+                        out.close()
+                        self.assertEqual(''.join(report.lines),
+                                         f.getvalue())
+                        with open(os.path.join(tmpdir,
+                                               report_filename(addr)),
+                                  encoding='UTF-8') as rf:
+                            data = rf.read()
+                        self.assertTrue(data.startswith(''.join(
+                            report.lines)))
+                        for k in report.keys.values():
+                            self.assertIn(format_key_summary(k), data)
+
+    def test_filename(self):
+        self.assertEqual(report_filename('dev@gentoo.org'),
+                         'dev@gentoo.org.txt')
+        self.assertEqual(report_filename(''), 'unknown.txt')
+        self.assertNotIn(os.sep, report_filename('a/b@gentoo.org'))
+
+
+class BugBundleTest(unittest.TestCase):
+    KEY = tests.test_key_other.ExpiredKeyTest.KEY
+    KEY_COLONS = tests.test_key_other.ExpiredKeyTest.GPG_COLONS
+    REPORTS = {
+        'nobody@gentoo.org': DeveloperReport(
+            ['DB44A8BC23B67AF4 validity:expired\n'], {id(KEY): KEY}),
+        'somebody@example.com': DeveloperReport(
+            ['DB44A8BC23B67AF4 validity:expired\n'], {id(KEY): KEY}),
+    }
+
+    def test_bug_url(self):
+        report = self.REPORTS['nobody@gentoo.org']
+        url = bug_url('nobody@gentoo.org', report)
+        self.assertTrue(url.startswith(BUG_URL + '?'))
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        self.assertEqual(params['assigned_to'], ['nobody@gentoo.org'])
+        self.assertEqual(params['short_desc'],
+                         ['nobody: OpenPGP key does not conform to GLEP 63'])
+        self.assertEqual(params['comment'],
+                         [BUG_COMMENT.format(format_report(report))])
+
+    def check_box(self, box):
+        messages = list(box)
+        self.assertEqual(len(messages), 1)
+        msg = messages[0]
+        self.assertEqual(msg['To'], 'nobody@gentoo.org')
+        body = msg.get_payload(decode=True).decode('UTF-8')
+        self.assertIn(bug_url('nobody@gentoo.org',
+                              self.REPORTS['nobody@gentoo.org']), body)
+        self.assertIn(format_key_summary(self.KEY), body)
+
+    def test_mbox(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'bugs.mbox')
+            self.assertEqual(write_bug_bundle(path, self.REPORTS), 1)
+            self.check_box(mailbox.mbox(path))
+
+    def test_maildir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'bugs')
+            self.assertEqual(write_bug_bundle(path, self.REPORTS, True), 1)
+            self.check_box(mailbox.Maildir(path))
+
+    def test_not_empty(self):
+        for maildir in (False, True):
+            with self.subTest(maildir=maildir):
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    path = os.path.join(tmpdir, 'bugs')
+                    self.assertFalse(bug_bundle_exists(path, maildir))
+                    write_bug_bundle(path, self.REPORTS, maildir)
+                    self.assertTrue(bug_bundle_exists(path, maildir))
+                    self.assertRaises(FileExistsError, write_bug_bundle,
+                                      path, self.REPORTS, maildir)
+                    box = (mailbox.Maildir(path) if maildir
+                           else mailbox.mbox(path))
+                    self.check_box(box)
+
+    def test_cli_twice(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            colons = os.path.join(tmpdir, 'keys.txt')
+            with open(colons, 'w', encoding='UTF-8') as f:
+                f.write(self.KEY_COLONS.lstrip())
+            path = os.path.join(tmpdir, 'bugs.mbox')
+            args = ['-G', colons, '--no-cache', '--bug-bundle', path]
+            self.assertEqual(run_main(args), (1, ''))
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertRaises(SystemExit, run_main, args)
+            self.assertEqual(len(mailbox.mbox(path)), 1)
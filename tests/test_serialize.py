@@ -0,0 +1,71 @@
+# glep63-check -- tests for serialization of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import io
+import json
+import unittest
+
+from glep63.check import (check_key,)
+from glep63.serialize import (KeyRegistry, encode_key, decode_key,
+                              encode_issues, decode_issues, dump_results,
+                              load_results)
+from glep63.specs import (SPECS,)
+
+import tests.key_base
+from tests.test_batch import (all_test_keys,)
+
+
+CONTEXT = tests.key_base.CONTEXT
+
+
+class SerializeTest(unittest.TestCase):
+    def test_key_round_trip(self):
+        for k in all_test_keys():
+            with self.subTest(k.keyid):
+                self.assertEqual(k, decode_key(encode_key(k)))
+                self.assertEqual(k, decode_key(
+                    json.loads(json.dumps(encode_key(k)))))
+
+    def test_issues_round_trip(self):
+        for k in all_test_keys():
+            for name, spec in SPECS.items():
+                with self.subTest(name, key=k.keyid):
+                    result = check_key(k, spec, CONTEXT)
+                    self.assertListEqual(result,
+                            decode_issues(k, encode_issues(k, result)))
+
+    def test_registry(self):
+        keys = list(all_test_keys())
+        registry = KeyRegistry()
+        issues = [i for k in keys
+                  for i in check_key(k, SPECS['glep63-2.1'], CONTEXT)]
+        records = [registry.record(i) for i in issues]
+        self.assertListEqual(issues, [registry.issue(r) for r in records])
+        # only keys with issues are registered, each of them once
+        self.assertEqual(len(registry.keys),
+                         len(set(id(i.key) for i in issues)))
+
+    def test_results_round_trip(self):
+        keys = list(all_test_keys())
+        registry = KeyRegistry(keys)
+        issues = dict((name, [i for k in keys
+                              for i in check_key(k, spec, CONTEXT)])
+                      for name, spec in SPECS.items())
+        f = io.StringIO()
+        dump_results(f, registry, dict(
+            (name, [registry.record(i) for i in spec_issues])
+            for name, spec_issues in issues.items()))
+
+        data = json.loads(f.getvalue())
+        self.assertEqual(len(data['keys']), len(keys))
+        self.assertEqual(dict((name, len(x))
+                              for name, x in data['issues'].items()),
+                         dict((name, len(x)) for name, x in issues.items()))
+
+        f.seek(0)
+        new_registry, records = load_results(f)
+        self.assertListEqual(keys, new_registry.keys)
+        self.assertEqual(issues, dict(
+            (name, [new_registry.issue(r) for r in spec_records])
+            for name, spec_records in records.items()))
@@ -0,0 +1,124 @@
+# glep63-check -- tests for snapshots of check results
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import datetime
+import io
+import json
+import os.path
+import tempfile
+import unittest
+
+from glep63.check import (EvaluationContext, check_key)
+from glep63.snapshot import (Snapshot, SnapshotDiff)
+from glep63.specs import (SPECS,)
+
+import tests.key_base
+import tests.test_key_expiration
+from tests.test_batch import (all_test_keys,)
+
+
+CONTEXT = tests.key_base.CONTEXT
+
+
+def describe(issues):
+    """
+    Return a list of (class name, subkey keyid, machine_desc) tuples
+    for @issues.
+    """
+
+    return [(i.__class__.__name__,
+             i.subkey.keyid if hasattr(i, 'subkey') else None,
+             i.machine_desc) for i in issues]
+
+
+class SnapshotTest(unittest.TestCase):
+    maxDiff = None
+
+    def make_snapshot(self, keys, context=CONTEXT):
+        snapshot = Snapshot()
+        for name, spec in SPECS.items():
+            for k in keys:
+                snapshot.add(name, check_key(k, spec, context))
+        return snapshot
+
+    def test_round_trip(self):
+        keys = list(all_test_keys())
+        snapshot = self.make_snapshot(keys)
+        f = io.StringIO()
+        snapshot.dump(f)
+
+        # every key with issues is stored once
+        data = json.loads(f.getvalue())
+        self.assertEqual(len(data['keys']), len(
+            [k for k in keys
+             if any(check_key(k, spec, CONTEXT) for spec in SPECS.values())]))
+
+        f.seek(0)
+        loaded = Snapshot.load(f)
+        for name, spec in SPECS.items():
+            with self.subTest(name):
+                self.assertListEqual(
+                    loaded.issues(name),
+                    [i for k in keys for i in check_key(k, spec, CONTEXT)])
+        self.assertListEqual(loaded.issues('unknown'), [])
+
+    def test_save(self):
+        snapshot = self.make_snapshot(list(all_test_keys()))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'snapshot.json')
+            for _ in range(2):
+                snapshot.save(path)
+                self.assertListEqual(os.listdir(tmpdir), ['snapshot.json'])
+                with open(path, encoding='UTF-8') as f:
+                    loaded = Snapshot.load(f)
+                for name in SPECS:
+                    self.assertListEqual(loaded.issues(name),
+                                         snapshot.issues(name))
+
+    def test_diff(self):
+        two_years = tests.test_key_expiration.PrimaryKeyTwoYearExpirationTest
+        three_weeks = (tests.test_key_expiration
+                       .PrimaryKeyThreeWeekExpirationTest)
+        # key, time of the later check, expected new and resolved issues
+        cases = [
+            (two_years, datetime.datetime(2018, 8, 12), [], []),
+            (two_years, datetime.datetime(2020, 8, 12),
+             [('KeyIssue', None, 'expire:short'),
+              ('SubKeyIssue', '3F911DBFC4B51F74', 'expire:short')],
+             []),
+            (three_weeks, datetime.datetime(2020, 8, 12),
+             [('KeyIssue', None, 'expire:short'),
+              ('SubKeyIssue', 'B600D9C92333A0BD', 'expire:short')],
+             [('KeyWarning', None, 'expire:short')]),
+        ]
+        for test, t, new, resolved in cases:
+            with self.subTest(test.__name__, t=t):
+                diff = SnapshotDiff(check_key(test.KEY, SPECS['glep63-2'],
+                                              CONTEXT))
+                self.assertListEqual(
+                    describe(diff.new(check_key(test.KEY, SPECS['glep63-2'],
+                                                EvaluationContext(t)))),
+                    new)
+                self.assertListEqual(describe(diff.resolved()), resolved)
+
+    def test_diff_unchanged(self):
+        for k in all_test_keys():
+            keyret = check_key(k, SPECS['glep63-2'], CONTEXT)
+            diff = SnapshotDiff(keyret)
+            self.assertListEqual(diff.new(keyret), [])
+            self.assertListEqual(diff.resolved(), [])
+
+    def test_diff_severity(self):
+        """
+        Test that a warning becoming an error is reported as a new
+        error and a resolved warning.
+        """
+        k = tests.test_key_expiration.PrimaryKeyThreeWeekExpirationTest.KEY
+        later = EvaluationContext(datetime.datetime(2018, 8, 12))
+        diff = SnapshotDiff(check_key(k, SPECS['glep63-2'], CONTEXT))
+        self.assertListEqual(
+            describe(diff.new(check_key(k, SPECS['glep63-2'], later))),
+            [('KeyIssue', None, 'expire:short')])
+        self.assertListEqual(describe(diff.resolved()),
+                             [('KeyWarning', None, 'expire:short')])
@@ -0,0 +1,135 @@
+# glep63-check -- tests for spec compilation
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import fnmatch
+import unittest
+
+from glep63.batch import (check_keys,)
+from glep63.check import (check_key, verdict_instants)
+from glep63.base import (FAIL,)
+from glep63.specs import (SPECS, RULES, CompiledSpec, compile_spec,
+                          drop_warnings, select_rules)
+
+import tests.key_base
+from tests.test_batch import (all_test_keys,)
+
+
+class CompileSpecTest(unittest.TestCase):
+    def test_cached(self):
+        for name, spec in SPECS.items():
+            with self.subTest(name):
+                compiled = compile_spec(spec)
+                self.assertIsInstance(compiled, CompiledSpec)
+                self.assertIs(compiled, compile_spec(spec))
+                self.assertIs(compiled, compile_spec(compiled))
+
+    def test_hashable(self):
+        compiled = set(compile_spec(spec) for spec in SPECS.values())
+        self.assertEqual(len(SPECS), len(compiled))
+
+    def test_fingerprint(self):
+        fingerprints = set(compile_spec(spec).fingerprint
+                           for spec in SPECS.values())
+        self.assertEqual(len(SPECS), len(fingerprints))
+
+        # equal contents give equal fingerprint
+        spec = SPECS['glep63-2'].copy()
+        spec['__doc__'] = 'A copy'
+        self.assertEqual(compile_spec(SPECS['glep63-2']).fingerprint,
+                         compile_spec(spec).fingerprint)
+
+
+class SelectRulesTest(unittest.TestCase):
+    maxDiff = None
+
+    FILTERS = [
+        (['expire:*'], None),
+        (['algo:*'], None),
+        (['uid:*', 'validity:*'], None),
+        (None, ['expire:*']),
+        (None, ['uid:nogentoo', 'validity:invalid']),
+        (['expire:*', 'algo:*'], ['expire:long']),
+        (['subkey:*'], None),
+    ]
+
+    def test_all_rules_known(self):
+        for k in all_test_keys():
+            for spec in SPECS.values():
+                for i in check_key(k, spec, tests.key_base.CONTEXT):
+                    self.assertIn(i.machine_desc, RULES)
+
+    def test_no_filter(self):
+        for spec in SPECS.values():
+            self.assertIs(compile_spec(spec), select_rules(spec))
+
+    def test_bad_pattern(self):
+        self.assertRaises(ValueError, select_rules, SPECS['glep63-2'],
+                          ['expire:foo'])
+        self.assertRaises(ValueError, select_rules, SPECS['glep63-2'],
+                          None, ['foo'])
+
+    def test_same_as_filtered(self):
+        """
+        Test that checking with selected rules gives the same results
+        as filtering the full results.
+        """
+        keys = list(all_test_keys())
+        for only, skip in self.FILTERS:
+            for name, spec in SPECS.items():
+                selected = select_rules(spec, only, skip)
+                expected = [
+                    [i for i in check_key(k, spec, tests.key_base.CONTEXT)
+                     if (only is None or any(fnmatch.fnmatchcase(
+                            i.machine_desc, p) for p in only))
+                     and not any(fnmatch.fnmatchcase(i.machine_desc, p)
+                                 for p in skip or [])]
+                    for k in keys]
+                with self.subTest(name, only=only, skip=skip):
+                    self.assertListEqual(
+                        [check_key(k, selected, tests.key_base.CONTEXT)
+                         for k in keys],
+                        expected)
+                    self.assertListEqual(
+                        check_keys(keys, selected, tests.key_base.CONTEXT),
+                        expected)
+
+    def test_pruned(self):
+        for name, spec in SPECS.items():
+            with self.subTest(name):
+                selected = select_rules(spec, ['algo:*'])
+                self.assertNotEqual(compile_spec(spec).fingerprint,
+                                    selected.fingerprint)
+                self.assertIsNone(selected.uid_nogentoo)
+                self.assertIsNone(selected.key.expire_max)
+                self.assertIsNone(selected.expire_short_fail)
+                for k in all_test_keys():
+                    self.assertListEqual(verdict_instants(k, selected), [])
+
+
+class DropWarningsTest(unittest.TestCase):
+    maxDiff = None
+
+    def test_same_errors(self):
+        keys = list(all_test_keys())
+        for name, spec in SPECS.items():
+            for selected in (select_rules(spec),
+                             select_rules(spec, None, ['expire:short'])):
+                pruned = drop_warnings(selected)
+                expected = [
+                    [i for i in check_key(k, selected, tests.key_base.CONTEXT)
+                     if type(i) in FAIL]
+                    for k in keys]
+                with self.subTest(name, rules=selected.rules):
+                    self.assertNotEqual(selected.fingerprint,
+                                        pruned.fingerprint)
+                    self.assertListEqual(
+                        [[i for i in check_key(k, pruned,
+                                               tests.key_base.CONTEXT)
+                          if type(i) in FAIL] for k in keys],
+                        expected)
+                    self.assertListEqual(
+                        [[i for i in keyret if type(i) in FAIL]
+                         for keyret in check_keys(keys, pruned,
+                                                  tests.key_base.CONTEXT)],
+                        expected)
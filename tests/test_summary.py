@@ -0,0 +1,48 @@
+# glep63-check -- tests for summary counts
+# (c) 2026 Michał Górny
+# Released under the terms of 2-clause BSD license.
+
+import collections
+import unittest
+
+from glep63.base import (FAIL,)
+from glep63.check import (check_key,)
+from glep63.specs import (SPECS,)
+from glep63.summary import (ERROR, WARNING, Summary, summarize_keys)
+
+import tests.key_base
+from tests.test_batch import (all_test_keys,)
+
+
+class SummarizeKeysTest(unittest.TestCase):
+    maxDiff = None
+
+    def test_summarize(self):
+        keys = list(all_test_keys())
+        context = tests.key_base.CONTEXT
+        expected = []
+        for spec in SPECS.values():
+            issues = collections.Counter()
+            error_keys = warning_keys = 0
+            for k in keys:
+                keyret = check_key(k, spec, context)
+                for i in keyret:
+                    issues[ERROR if type(i) in FAIL else WARNING,
+                           i.machine_desc] += 1
+                if any(type(i) in FAIL for i in keyret):
+                    error_keys += 1
+                elif keyret:
+                    warning_keys += 1
+            expected.append(Summary(len(keys), error_keys, warning_keys,
+                                    issues))
+
+        # pass a generator to check that keys are consumed in chunks
+        self.assertListEqual(
+            summarize_keys((k for k in keys), list(SPECS.values()),
+                           context, chunk_size=5),
+            expected)
+
+    def test_empty(self):
+        self.assertListEqual(
+            summarize_keys(iter([]), [SPECS['glep63-2.1']]),
+            [Summary(0, 0, 0, collections.Counter())])